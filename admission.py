@@ -0,0 +1,122 @@
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Transformer passes allowed to run at once
+DEFAULT_MAX_CONCURRENT = 2
+
+# Callers allowed to wait for a slot before new ones are turned away
+DEFAULT_MAX_QUEUE = 8
+
+# Seconds a caller may wait for a slot
+DEFAULT_QUEUE_TIMEOUT = 0.5
+
+# Smoothing factor of the moving average of service times
+SERVICE_TIME_SMOOTHING = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when the embedding path is saturated and a caller is turned away"""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Embedding capacity exceeded ({reason}), retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounds the number of concurrent callers of an expensive path, with a bounded
+    wait queue and a deadline for waiting callers
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_queue: int = DEFAULT_MAX_QUEUE,
+                 queue_timeout: float = DEFAULT_QUEUE_TIMEOUT):
+        """
+        Initialize the AdmissionController
+
+        Args:
+            max_concurrent: Number of callers allowed in at once
+            max_queue: Number of callers allowed to wait for a slot
+            queue_timeout: Seconds a caller may wait before it is rejected
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.service_time = 0.0
+        self.counters = Counter()
+        self._condition = threading.Condition()
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain, at least 1"""
+        backlog = (self.active + self.waiting) / self.max_concurrent
+        return max(1, math.ceil(backlog * self.service_time))
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.counters[f"rejected_{reason.replace(' ', '_')}"] += 1
+        return AdmissionRejected(reason, self.retry_after())
+
+    @contextmanager
+    def admit(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of the block
+
+        Args:
+            timeout: Seconds to wait for a slot (defaults to queue_timeout)
+
+        Raises:
+            AdmissionRejected: If the wait queue is full or no slot frees up before the deadline
+        """
+        deadline = time.monotonic() + (self.queue_timeout if timeout is None else timeout)
+        with self._condition:
+            if self.active >= self.max_concurrent:
+                if self.waiting >= self.max_queue:
+                    raise self._reject('queue full')
+                self.waiting += 1
+                self.counters['queued'] += 1
+                try:
+                    while self.active >= self.max_concurrent:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise self._reject('deadline exceeded')
+                        self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self.counters['admitted'] += 1
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._condition:
+                self.active -= 1
+                self.counters['completed'] += 1
+                if self.counters['completed'] == 1:
+                    self.service_time = elapsed
+                else:
+                    self.service_time += SERVICE_TIME_SMOOTHING * (elapsed - self.service_time)
+                self._condition.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get admission counters and the current load
+
+        Returns:
+            Dictionary with the counters, active and waiting callers and the average service time
+        """
+        with self._condition:
+            stats = dict(self.counters)
+            stats.update(active=self.active, waiting=self.waiting, service_time=self.service_time)
+        return stats
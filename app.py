@@ -1,9 +1,12 @@
 from flask import Flask, render_template, request, jsonify, session, redirect, url_for
-import torch
 import os
 import json
 import logging
 from career_advisor import CareerAdvisorAI
+from http_cache import HTTPCache, fingerprint_directory
+from static_assets import StaticAssetManifest
+from semantic_search import DEFAULT_PROFILE_WEIGHT
+from admission import AdmissionRejected
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -13,16 +16,51 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # For session management
 
-# Check for GPU
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-logger.info(f"Using device: {device}")
-
 # Initialize Career Advisor AI
-advisor = CareerAdvisorAI()
+# Set CAREER_ADVISOR_TORCHSCRIPT=1 to serve with the compiled TorchScript encoder
+# and CAREER_ADVISOR_SNAPSHOT to a snapshot file to warm-start from it
+advisor = CareerAdvisorAI(use_torchscript=os.environ.get('CAREER_ADVISOR_TORCHSCRIPT') == '1',
+                          snapshot_path=os.environ.get('CAREER_ADVISOR_SNAPSHOT'))
+
+# Build the subject matcher now rather than on the first study plan request
+advisor.get_subject_matcher()
+
+# Build fingerprinted, precompressed static assets and expose asset_url() to templates
+assets = StaticAssetManifest(app.static_folder, os.path.join(app.root_path, 'build', 'assets'))
+assets.build()
+assets.init_app(app)
+
+# Cache static pages and study plans, validated against the dataset, model, template and asset versions
+http_cache = HTTPCache(version=f"{advisor.cache_version}:{fingerprint_directory(app.template_folder)}:"
+                               f"{fingerprint_directory(app.static_folder)}",
+                       last_modified=advisor.datasets_loaded_at)
+
+# When BERT is saturated, serve study plans from the best n-gram match ('degrade')
+# or answer 503 with Retry-After ('reject')
+OVERLOAD_POLICY = os.environ.get('CAREER_ADVISOR_OVERLOAD_POLICY', 'degrade')
+
+def overloaded_response(error, body=None):
+    """503 response asking the client to retry once the embedding backlog drains"""
+    logger.warning(f"Shedding request: {error}")
+    response = body if body is not None else jsonify({'error': 'Service overloaded, please retry'})
+    response = app.make_response(response)
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def degraded_study_plan(major):
+    """Study plan matched without BERT, never cached since a full match may differ"""
+    return advisor.generate_study_plan(major, degraded=True)
 
 @app.route('/')
 def index():
     """Landing page"""
+    # Release the speculative study plans this session queued for the previous run; plans
+    # other sessions still wait for are kept
+    previous_plans = session.get('speculative_plans', [])
+    if previous_plans:
+        advisor.plan_planner.cancel((major, ticket) for major, ticket in previous_plans)
+    
     # Reset session data when starting fresh
     session.clear()
     return render_template('index.html')
@@ -48,7 +86,9 @@ def personality_assessment():
         return redirect(url_for('interest_assessment'))
     
     # GET request - show the form
-    return render_template('personality_assessment.html', questions=advisor.personality_questions)
+    return http_cache.conditional_response(
+        http_cache.etag('personality_assessment.html'),
+        lambda: http_cache.render_cached('personality_assessment.html', questions=advisor.personality_questions))
 
 @app.route('/assessment/interests', methods=['GET', 'POST'])
 def interest_assessment():
@@ -82,6 +122,9 @@ def interest_assessment():
         career_recommendations = advisor.recommend_careers(trait_scores, interest_scores)
         university_recommendations = advisor.recommend_universities(career_recommendations)
         
+        # Start generating study plans for the recommended careers before the user asks for one
+        session['speculative_plans'] = advisor.precompute_study_plans(career_recommendations)
+        
         # Store results in session
         session['trait_scores'] = trait_scores
         session['career_recommendations'] = career_recommendations
@@ -91,7 +134,37 @@ def interest_assessment():
         return redirect(url_for('results'))
     
     # GET request - show the form
-    return render_template('interest_assessment.html', questions=advisor.subject_interest_questions)
+    return http_cache.conditional_response(
+        http_cache.etag('interest_assessment.html'),
+        lambda: http_cache.render_cached('interest_assessment.html', questions=advisor.subject_interest_questions))
+
+def top_n_from_request(data, default=3):
+    """Read the number of results from a JSON body, raising ValueError unless it is a positive integer"""
+    try:
+        top_n = int(data.get('top_n', default))
+    except (TypeError, ValueError):
+        raise ValueError(f"top_n must be a positive integer, got {data.get('top_n')!r}")
+    if top_n < 1:
+        raise ValueError(f"top_n must be a positive integer, got {top_n}")
+    return top_n
+
+def university_filters_from_request():
+    """Read the university constraint filters from the query string"""
+    filters = {}
+    state = request.args.get('state', '').strip()
+    if state:
+        filters['state'] = state
+    for name in ('max_cost', 'min_graduation_rate'):
+        value = request.args.get(name, '').strip()
+        if value:
+            try:
+                filters[name] = float(value)
+            except ValueError:
+                pass
+    programs = [program for program in request.args.getlist('programs') if program]
+    if programs:
+        filters['required_programs'] = programs
+    return filters
 
 @app.route('/results')
 def results():
@@ -105,10 +178,18 @@ def results():
     career_recommendations = session.get('career_recommendations', [])
     university_recommendations = session.get('university_recommendations', [])
     
+    # Re-rank universities when the student restricts them by state, cost, graduation rate or programs
+    filters = university_filters_from_request()
+    if filters:
+        university_recommendations = advisor.recommend_universities(career_recommendations, **filters)
+    
     return render_template('results.html', 
                           trait_scores=trait_scores,
                           career_recommendations=career_recommendations,
-                          university_recommendations=university_recommendations)
+                          university_recommendations=university_recommendations,
+                          filters=filters,
+                          states=sorted(advisor.university_index.location_bitmaps),
+                          programs=sorted(advisor.university_index.program_bitmaps))
 
 @app.route('/study-plan', methods=['GET', 'POST'])
 def study_plan():
@@ -116,7 +197,13 @@ def study_plan():
     if request.method == 'POST':
         major = request.form.get('major', '')
         if major:
-            study_plan = advisor.generate_study_plan(major)
+            try:
+                study_plan = http_cache.memoize(http_cache.etag('study-plan', major),
+                                                lambda: advisor.get_study_plan(major))
+            except AdmissionRejected as e:
+                if OVERLOAD_POLICY != 'degrade':
+                    return overloaded_response(e, render_template('study_plan_form.html', suggested_major=major))
+                study_plan = degraded_study_plan(major)
             return render_template('study_plan.html', study_plan=study_plan, major=major)
     
     # Default - show form
@@ -135,8 +222,79 @@ def api_generate_study_plan():
     if not major:
         return jsonify({'error': 'Major is required'}), 400
     
-    study_plan = advisor.generate_study_plan(major)
-    return jsonify(study_plan)
+    # Study plans are deterministic for a major, so validate them like static content
+    etag = http_cache.etag('study-plan', major)
+    try:
+        return http_cache.conditional_response(
+            etag,
+            lambda: jsonify(http_cache.memoize(etag, lambda: advisor.get_study_plan(major))))
+    except AdmissionRejected as e:
+        if OVERLOAD_POLICY != 'degrade':
+            return overloaded_response(e)
+        response = jsonify(degraded_study_plan(major))
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+@app.route('/api/weight-sweep', methods=['POST'])
+def api_weight_sweep():
+    """API endpoint for ranking careers or universities over a grid of score weights"""
+    data = request.json or {}
+    target = data.get('target', 'careers')
+    weights = data.get('weights')
+    
+    if not weights:
+        return jsonify({'error': 'Weights are required'}), 400
+    
+    try:
+        top_n = top_n_from_request(data)
+        if target == 'careers':
+            trait_scores = data.get('trait_scores', session.get('trait_scores'))
+            interest_scores = data.get('interest_scores')
+            if interest_scores is None and 'interest_answers' in session:
+                interest_scores = advisor.assess_interests(session['interest_answers'])
+            if trait_scores is None or interest_scores is None:
+                return jsonify({'error': 'Trait and interest scores are required'}), 400
+            sweep = advisor.sweep_career_weights(trait_scores, interest_scores, weights, top_n)
+        elif target == 'universities':
+            career_recommendations = data.get('career_recommendations', session.get('career_recommendations'))
+            if not career_recommendations:
+                return jsonify({'error': 'Career recommendations are required'}), 400
+            sweep = advisor.sweep_university_weights(career_recommendations, weights, top_n,
+                                                     **data.get('filters', {}))
+        else:
+            return jsonify({'error': f"Unknown target: {target}"}), 400
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'target': target, 'sweep': sweep})
+
+@app.route('/api/semantic-careers', methods=['POST'])
+def api_semantic_careers():
+    """API endpoint for recommending careers from free-text goals"""
+    data = request.json or {}
+    goals = data.get('goals', [data['goal']] if data.get('goal') else [])
+    
+    if not isinstance(goals, list) or not goals or not all(isinstance(goal, str) and goal for goal in goals):
+        return jsonify({'error': 'Goal is required'}), 400
+    
+    try:
+        top_n = top_n_from_request(data)
+        # Blend with the student's assessment when one is given or stored in the session
+        profiles = data.get('profiles')
+        if profiles is not None:
+            profiles = [(profile.get('trait_scores', {}), profile.get('interest_scores', {})) for profile in profiles]
+        elif len(goals) == 1 and 'trait_scores' in session and 'interest_answers' in session:
+            profiles = [(session['trait_scores'], advisor.assess_interests(session['interest_answers']))]
+        
+        profile_weight = float(data.get('profile_weight', DEFAULT_PROFILE_WEIGHT))
+        recommendations = advisor.recommend_careers_semantic(goals, top_n, profiles, profile_weight)
+    except (AttributeError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except AdmissionRejected as e:
+        return overloaded_response(e)
+    
+    return jsonify({'results': [{'goal': goal, 'recommendations': ranked}
+                                for goal, ranked in zip(goals, recommendations)]})
 
 if __name__ == '__main__':
     # Run the Flask app
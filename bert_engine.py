@@ -0,0 +1,198 @@
+import torch
+import numpy as np
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Fixed sequence-length buckets the encoder is traced for
+DEFAULT_BUCKETS = (16, 32, 64, 128, 256, 512)
+
+# Probe sentences used to check the compiled graphs against eager mode
+VERIFICATION_TEXTS = [
+    'Computer Science',
+    'Develops applications and systems using programming languages',
+    'I want to build apps that help hospitals'
+]
+
+
+class CLSEncoder(torch.nn.Module):
+    """
+    Wraps a BertModel so that the traced graph only returns the [CLS] embedding
+    """
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids: torch.Tensor, attention_mask: torch.Tensor, token_type_ids: torch.Tensor) -> torch.Tensor:
+        outputs = self.model(input_ids=input_ids,
+                             attention_mask=attention_mask,
+                             token_type_ids=token_type_ids,
+                             return_dict=False)
+        return outputs[0][:, 0, :]
+
+
+class TorchScriptBertEngine:
+    """
+    CPU serving engine that runs frozen TorchScript graphs of the BERT encoder,
+    one per fixed sequence-length bucket
+    """
+
+    def __init__(self, tokenizer, model_name: str, revision: str, device: torch.device,
+                 cache_dir: str = os.path.join("models", "torchscript"),
+                 buckets: Sequence[int] = DEFAULT_BUCKETS):
+        """
+        Initialize the TorchScriptBertEngine
+
+        Args:
+            tokenizer: Tokenizer matching the traced model
+            model_name: Name of the pretrained model
+            revision: Model revision the artifacts are keyed by
+            device: Device the graphs are loaded onto
+            cache_dir: Root directory for compiled artifacts
+            buckets: Sequence lengths to trace the encoder for
+        """
+        self.tokenizer = tokenizer
+        self.model_name = model_name
+        self.revision = revision
+        self.device = device
+        self.cache_dir = cache_dir
+        self.buckets = sorted(buckets)
+        self.graphs: Dict[int, torch.jit.ScriptModule] = {}
+
+    @property
+    def artifact_dir(self) -> str:
+        """Directory holding the artifacts for this model revision"""
+        safe_name = self.model_name.strip('/').replace('/', '--')
+        return os.path.join(self.cache_dir, safe_name, self.revision)
+
+    @property
+    def available(self) -> bool:
+        """Whether at least one compiled bucket is loaded"""
+        return bool(self.graphs)
+
+    def _artifact_path(self, bucket: int) -> str:
+        return os.path.join(self.artifact_dir, f"cls_{bucket}.pt")
+
+    def _encode(self, text: str, bucket: int) -> Dict[str, torch.Tensor]:
+        inputs = self.tokenizer(text, return_tensors="pt", padding='max_length', truncation=True, max_length=bucket)
+        return {name: inputs[name].to(self.device) for name in ('input_ids', 'attention_mask', 'token_type_ids')}
+
+    def compile(self, model: torch.nn.Module) -> Dict[int, float]:
+        """
+        Trace and freeze the encoder for every bucket and save the artifacts
+
+        Args:
+            model: Eager BertModel to trace
+
+        Returns:
+            Dictionary mapping buckets to the max absolute difference from eager mode
+        """
+        logger.info(f"Compiling TorchScript encoder to {self.artifact_dir}...")
+        os.makedirs(self.artifact_dir, exist_ok=True)
+
+        encoder = CLSEncoder(model).eval()
+        for bucket in self.buckets:
+            inputs = self._encode(VERIFICATION_TEXTS[0], bucket)
+            with torch.no_grad():
+                traced = torch.jit.trace(encoder, (inputs['input_ids'], inputs['attention_mask'], inputs['token_type_ids']))
+                frozen = torch.jit.freeze(traced)
+            torch.jit.save(frozen, self._artifact_path(bucket))
+            self.graphs[bucket] = frozen
+
+        manifest = {
+            'model_name': self.model_name,
+            'revision': self.revision,
+            'buckets': self.buckets,
+            'torch_version': torch.__version__
+        }
+        with open(os.path.join(self.artifact_dir, "manifest.json"), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        logger.info(f"Compiled {len(self.graphs)} TorchScript buckets")
+        return self.verify(model)
+
+    def load(self) -> bool:
+        """
+        Load the compiled artifacts for this model revision from disk
+
+        Returns:
+            True if any bucket was loaded, False if the artifacts are missing
+        """
+        manifest_file = os.path.join(self.artifact_dir, "manifest.json")
+        if not os.path.exists(manifest_file):
+            logger.info(f"No TorchScript artifacts found in {self.artifact_dir}")
+            return False
+
+        with open(manifest_file) as f:
+            manifest = json.load(f)
+        if manifest.get('torch_version') != torch.__version__:
+            logger.warning(f"TorchScript artifacts were built with torch {manifest.get('torch_version')}, "
+                           f"running {torch.__version__}; ignoring them")
+            return False
+
+        for bucket in manifest['buckets']:
+            path = self._artifact_path(bucket)
+            if os.path.exists(path):
+                self.graphs[bucket] = torch.jit.load(path, map_location=self.device)
+        self.buckets = sorted(self.graphs)
+
+        logger.info(f"Loaded TorchScript buckets: {self.buckets}")
+        return self.available
+
+    def bucket_for(self, length: int) -> Optional[int]:
+        """Return the smallest loaded bucket that fits a sequence of the given length"""
+        for bucket in self.buckets:
+            if length <= bucket and bucket in self.graphs:
+                return bucket
+        return None
+
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Get the [CLS] embedding for a text using the compiled graphs
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            The embedding, or None if no loaded bucket fits the text
+        """
+        length = len(self.tokenizer(text, truncation=True, max_length=512)['input_ids'])
+        bucket = self.bucket_for(length)
+        if bucket is None:
+            return None
+
+        inputs = self._encode(text, bucket)
+        with torch.no_grad():
+            cls = self.graphs[bucket](inputs['input_ids'], inputs['attention_mask'], inputs['token_type_ids'])
+        return cls[0].cpu().numpy()
+
+    def verify(self, model: torch.nn.Module, texts: Optional[List[str]] = None) -> Dict[int, float]:
+        """
+        Compare the compiled graphs against eager mode
+
+        Args:
+            model: Eager BertModel to compare against
+            texts: Texts to compare on (defaults to the built-in probe sentences)
+
+        Returns:
+            Dictionary mapping buckets to the max absolute difference from eager mode
+        """
+        texts = texts or VERIFICATION_TEXTS
+        diffs = {}
+        for bucket, graph in self.graphs.items():
+            max_diff = 0.0
+            for text in texts:
+                eager_inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=bucket).to(self.device)
+                inputs = self._encode(text, bucket)
+                with torch.no_grad():
+                    eager = model(**eager_inputs).last_hidden_state[:, 0, :]
+                    compiled = graph(inputs['input_ids'], inputs['attention_mask'], inputs['token_type_ids'])
+                max_diff = max(max_diff, (eager - compiled).abs().max().item())
+            diffs[bucket] = max_diff
+        return diffs
@@ -1,244 +1,278 @@
-import torch
 import pandas as pd
 import numpy as np
-from transformers import BertTokenizer, BertModel
-from sklearn.metrics.pairwise import cosine_similarity
-import requests
 import json
 import os
-from typing import List, Dict, Tuple, Any
+import time
+import hashlib
+from functools import lru_cache
+from typing import List, Dict, Tuple, Any, Optional, TYPE_CHECKING
 import logging
+from university_index import UniversityIndex
+from topk_engine import CareerTopKEngine, CAREER_WEIGHTS
+from weight_sweep import WeightSweeper
+from memory_report import deep_sizeof, module_bytes, tokenizer_bytes
+from speculative import SpeculativePlanner
+from admission import AdmissionController
+from question_bank import QuestionBank, LIKERT_SCALE, PERSONALITY_QUESTIONS, SUBJECT_INTEREST_QUESTIONS
+from catalog_store import CatalogStore, CATALOG_DATASETS
+from semantic_search import SemanticCareerIndex, occupation_text, SEMANTIC_CACHE_DIR, DEFAULT_PROFILE_WEIGHT
+
+# torch, transformers and sklearn are imported by the methods that need them,
+# so that data preparation and pure scoring start without loading them
+if TYPE_CHECKING:
+    from bert_engine import TorchScriptBertEngine
+    from subject_index import SubjectIndex
+    from subject_matcher import TieredSubjectMatcher
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Check for GPU availability
-device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-logger.info(f"Using device: {device}")
+@lru_cache(maxsize=None)
+def get_device():
+    """Check for GPU availability (imports torch)"""
+    import torch
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    logger.info(f"Using device: {device}")
+    return device
+
+BERT_MODEL_NAME = 'bert-base-uncased'
+
+# Max absolute difference allowed between TorchScript and eager [CLS] embeddings
+TORCHSCRIPT_TOLERANCE = 1e-4
+
+# Bump when the content of generated study plans changes, so cached plans are revalidated
+STUDY_PLAN_VERSION = 1
 
 class CareerAdvisorAI:
-    def __init__(self):
+    def __init__(self, use_torchscript: bool = False, subject_dimensions: Optional[int] = None,
+                 speculative_workers: int = 1, snapshot_path: Optional[str] = None, load_model: bool = True):
         logger.info("Initializing Career Advisor AI...")
         
-        # Load BERT model and tokenizer
-        self.tokenizer = BertTokenizer.from_pretrained('bert-base-uncased')
-        self.model = BertModel.from_pretrained('bert-base-uncased').to(device)
+        # PCA dimensions for the float16 subject index (None keeps full float32 vectors)
+        self.subject_dimensions = subject_dimensions
+        self.subject_embeddings = None
+        self.subject_index = None
+        self.subject_matcher = None
+        self.career_index = None
+        
+        # Bounded concurrency and wait queue for transformer passes
+        self.bert_admission = AdmissionController()
+        
+        # Load time and memory of each catalog dataset, filled in by load_datasets
+        self.dataset_load_report = {}
+        
+        if load_model and snapshot_path is not None:
+            # Restore the model, datasets, indexes, embeddings and questions from a warm-start snapshot
+            from snapshot import restore_snapshot
+            self.device = get_device()
+            restore_snapshot(self, snapshot_path, self.device)
+            self.subject_matcher.embedding_match = self.match_subject_embedding
+        else:
+            # Load BERT model and tokenizer, unless only scoring is needed
+            self.tokenizer = self.model = self.device = None
+            if load_model:
+                from transformers import BertTokenizer, BertModel
+                self.device = get_device()
+                self.tokenizer = BertTokenizer.from_pretrained(BERT_MODEL_NAME)
+                self.model = BertModel.from_pretrained(BERT_MODEL_NAME).to(self.device)
+                self.model.eval()
+            
+            # Load datasets
+            self.load_datasets()
+            
+            # Define personality assessment questions
+            self.personality_questions = self.generate_personality_questions()
+            self.subject_interest_questions = self.generate_subject_interest_questions()
         
-        # Load datasets
-        self.load_datasets()
+        # Compile the questions into sparse loading matrices for scoring
+        self.personality_bank = QuestionBank(self.personality_questions, 'trait')
+        self.interest_bank = QuestionBank(self.subject_interest_questions, 'subject')
         
-        # Define personality assessment questions
-        self.personality_questions = self.generate_personality_questions()
-        self.subject_interest_questions = self.generate_subject_interest_questions()
+        # Load the compiled TorchScript encoder if requested, falling back to eager mode
+        self.bert_engine = self.load_bert_engine() if use_torchscript else None
+        
+        # Background pool precomputing study plans for the recommended careers
+        self.plan_planner = SpeculativePlanner(self.generate_study_plan, max_workers=speculative_workers)
         
         logger.info("Career Advisor AI initialized successfully")
     
-    def load_datasets(self):
-        """Load and preprocess the required datasets"""
+    def load_datasets(self, data_dir: str = "data"):
+        """
+        Load and preprocess the required datasets
+        
+        Args:
+            data_dir: Directory the DataProcessor writes the datasets to
+        """
         logger.info("Loading datasets...")
         
-        # In a real implementation, you would load the actual datasets
-        # For this example, we'll create simplified mock datasets
-        
-        # Mock O*NET database for career recommendations
-        self.onet_data = pd.DataFrame({
-            'occupation': ['Software Developer', 'Data Scientist', 'Doctor', 'Teacher', 'Lawyer', 'Accountant'],
-            'description': [
-                'Develops applications and systems using programming languages',
-                'Analyzes data and builds models to extract insights',
-                'Diagnoses and treats medical conditions',
-                'Educates students in various subjects',
-                'Provides legal advice and represents clients',
-                'Prepares and examines financial records'
-            ],
-            'personality_traits': [
-                'analytical,creative,detail-oriented',
-                'analytical,curious,technical',
-                'compassionate,detail-oriented,patient',
-                'patient,communicative,organized',
-                'analytical,persuasive,detail-oriented',
-                'detail-oriented,analytical,organized'
-            ],
-            'interests': [
-                'programming,problem-solving,technology',
-                'mathematics,statistics,technology',
-                'biology,chemistry,helping others',
-                'education,communication,mentoring',
-                'debate,research,writing',
-                'mathematics,business,organization'
-            ],
-            'education_required': [
-                "Bachelor's degree in Computer Science",
-                "Master's degree in Data Science or related field",
-                "Medical Degree (MD)",
-                "Bachelor's degree in Education",
-                "Law Degree (JD)",
-                "Bachelor's degree in Accounting"
-            ]
-        })
-        
-        # Mock College Scorecard data for university recommendations
-        self.college_data = pd.DataFrame({
-            'university': ['MIT', 'Stanford', 'Harvard', 'UC Berkeley', 'Georgia Tech', 'University of Michigan'],
-            'location': ['Massachusetts', 'California', 'Massachusetts', 'California', 'Georgia', 'Michigan'],
-            'programs': [
-                'Computer Science,Engineering,Mathematics',
-                'Computer Science,Business,Medicine',
-                'Law,Business,Medicine',
-                'Computer Science,Engineering,Business',
-                'Engineering,Computer Science,Mathematics',
-                'Engineering,Business,Medicine'
-            ],
-            'cost': [55000, 57000, 54000, 43000, 33000, 49000],
-            'acceptance_rate': [0.07, 0.05, 0.05, 0.16, 0.21, 0.23],
-            'graduation_rate': [0.94, 0.96, 0.97, 0.91, 0.87, 0.92]
-        })
-        
-        # Mock study resources data
-        self.resources_data = pd.DataFrame({
-            'subject': ['Computer Science', 'Data Science', 'Medicine', 'Education', 'Law', 'Accounting'],
-            'books': [
-                'Introduction to Algorithms by Cormen et al.',
-                'Python for Data Analysis by Wes McKinney',
-                'Gray\'s Anatomy',
-                'Teaching to Transgress by bell hooks',
-                'Law 101 by Jay Feinman',
-                'Financial Accounting by Warren et al.'
-            ],
-            'courses': [
-                'CS50 (Harvard),Introduction to Computer Science (MIT)',
-                'Data Science Specialization (Coursera),Machine Learning (Stanford)',
-                'Introduction to Medicine (Coursera),Human Anatomy (edX)',
-                'Teaching Methods (Coursera),Educational Psychology (edX)',
-                'Introduction to Law (Coursera),Contract Law (edX)',
-                'Financial Accounting (Coursera),Taxation Principles (edX)'
-            ],
-            'videos': [
-                'https://www.youtube.com/c/MITOpenCourseWare',
-                'https://www.youtube.com/c/3blue1brown',
-                'https://www.youtube.com/c/osmosis',
-                'https://www.youtube.com/c/edutopia',
-                'https://www.youtube.com/c/LexFridman',
-                'https://www.youtube.com/c/AccountingStuff'
-            ]
-        })
+        # Open the typed columnar catalog written by the DataProcessor, preparing it on first run
+        catalog = CatalogStore(os.path.join(data_dir, "catalog"))
+        if not all(catalog.exists(name) for name in CATALOG_DATASETS):
+            logger.info("Catalog not found, preparing datasets...")
+            from data_processor import DataProcessor
+            DataProcessor(data_dir).prepare_all_datasets()
+        datasets = catalog.open_all()
+        self.onet_data = datasets['onet_data']
+        self.college_data = datasets['college_data']
+        self.resources_data = datasets['resources_data']
+        self.dataset_load_report = catalog.report
+        
+        # Posting lists for top-k career retrieval
+        self.career_engine = CareerTopKEngine(self.onet_data)
+        
+        # Secondary indexes for constraint filtering of universities
+        self.university_index = UniversityIndex(self.college_data)
+        
+        # Component score matrices for what-if weight sweeps
+        self.weight_sweeper = WeightSweeper(self.career_engine, self.university_index)
+        
+        # Version and load time of the datasets, used to validate cached responses
+        self.dataset_version = self.compute_dataset_version()
+        self.datasets_loaded_at = time.time()
         
         logger.info("Datasets loaded successfully")
     
+    def compute_dataset_version(self) -> str:
+        """Compute a content hash of the loaded datasets"""
+        digest = hashlib.sha256()
+        for data in (self.onet_data, self.college_data, self.resources_data):
+            digest.update(",".join(data.columns).encode('utf-8'))
+            digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+        return digest.hexdigest()[:16]
+    
+    @property
+    def cache_version(self) -> str:
+        """Version string covering everything that affects recommendations and study plans"""
+        return (f"{BERT_MODEL_NAME}@{self.model_revision}:{self.dataset_version}:{self.subject_dimensions}:"
+                f"{self.get_subject_matcher().version}:plan{STUDY_PLAN_VERSION}")
+    
     def generate_personality_questions(self) -> List[Dict[str, Any]]:
         """Generate personality assessment questions"""
-        return [
-            {
-                "id": "analytical",
-                "question": "Do you enjoy solving complex problems and puzzles?",
-                "trait": "analytical"
-            },
-            {
-                "id": "creative",
-                "question": "Do you often come up with unique ideas or solutions?",
-                "trait": "creative"
-            },
-            {
-                "id": "detail_oriented",
-                "question": "Do you pay close attention to details and notice small errors?",
-                "trait": "detail-oriented"
-            },
-            {
-                "id": "patient",
-                "question": "Are you patient when dealing with challenging situations?",
-                "trait": "patient"
-            },
-            {
-                "id": "communicative",
-                "question": "Do you enjoy explaining concepts to others?",
-                "trait": "communicative"
-            },
-            {
-                "id": "organized",
-                "question": "Do you prefer to have a structured plan for your activities?",
-                "trait": "organized"
-            },
-            {
-                "id": "persuasive",
-                "question": "Are you good at convincing others of your point of view?",
-                "trait": "persuasive"
-            },
-            {
-                "id": "curious",
-                "question": "Do you often seek to learn new things out of curiosity?",
-                "trait": "curious"
-            },
-            {
-                "id": "technical",
-                "question": "Do you enjoy working with technology and learning how things work?",
-                "trait": "technical"
-            },
-            {
-                "id": "compassionate",
-                "question": "Do you feel strongly about helping others in need?",
-                "trait": "compassionate"
-            }
-        ]
+        return [dict(question) for question in PERSONALITY_QUESTIONS]
     
     def generate_subject_interest_questions(self) -> List[Dict[str, Any]]:
         """Generate subject interest assessment questions"""
-        return [
-            {
-                "id": "programming",
-                "question": "How much do you enjoy programming or coding?",
-                "subject": "programming"
-            },
-            {
-                "id": "mathematics",
-                "question": "How interested are you in mathematics and statistical analysis?",
-                "subject": "mathematics"
-            },
-            {
-                "id": "biology",
-                "question": "How interested are you in biology and life sciences?",
-                "subject": "biology"
-            },
-            {
-                "id": "chemistry",
-                "question": "How interested are you in chemistry and chemical processes?",
-                "subject": "chemistry"
-            },
-            {
-                "id": "education",
-                "question": "How much do you enjoy teaching or explaining concepts to others?",
-                "subject": "education"
-            },
-            {
-                "id": "business",
-                "question": "How interested are you in business and entrepreneurship?",
-                "subject": "business"
-            },
-            {
-                "id": "writing",
-                "question": "How much do you enjoy writing and communication?",
-                "subject": "writing"
-            },
-            {
-                "id": "technology",
-                "question": "How interested are you in technology and its applications?",
-                "subject": "technology"
-            },
-            {
-                "id": "helping_others",
-                "question": "How important is it for you to directly help others in your career?",
-                "subject": "helping others"
-            },
-            {
-                "id": "research",
-                "question": "How much do you enjoy conducting research and investigation?",
-                "subject": "research"
-            }
-        ]
+        return [dict(question) for question in SUBJECT_INTEREST_QUESTIONS]
+    
+    @property
+    def model_revision(self) -> str:
+        """Revision of the loaded BERT model"""
+        if self.model is None:
+            return 'none'
+        return getattr(self.model.config, '_commit_hash', None) or 'main'
+    
+    def create_bert_engine(self) -> 'TorchScriptBertEngine':
+        """Create a TorchScript engine for the loaded BERT model"""
+        from bert_engine import TorchScriptBertEngine
+        return TorchScriptBertEngine(self.tokenizer, BERT_MODEL_NAME, self.model_revision, self.device)
+    
+    def load_bert_engine(self) -> Optional['TorchScriptBertEngine']:
+        """
+        Load the compiled TorchScript encoder for the current model revision
+        
+        Returns:
+            The engine, or None if the artifacts are missing or do not match eager mode
+        """
+        engine = self.create_bert_engine()
+        if not engine.load():
+            logger.info("Using eager BERT inference")
+            return None
+        
+        diffs = engine.verify(self.model)
+        if max(diffs.values()) > TORCHSCRIPT_TOLERANCE:
+            logger.warning(f"TorchScript outputs differ from eager mode ({diffs}); using eager BERT inference")
+            return None
+        
+        logger.info("Using TorchScript BERT inference")
+        return engine
+    
+    def compile_bert_engine(self) -> Dict[int, float]:
+        """
+        Trace, freeze and save the TorchScript encoder, then switch to it
+        
+        Returns:
+            Dictionary mapping buckets to the max absolute difference from eager mode
+        """
+        engine = self.create_bert_engine()
+        diffs = engine.compile(self.model)
+        if max(diffs.values()) > TORCHSCRIPT_TOLERANCE:
+            raise RuntimeError(f"TorchScript outputs differ from eager mode by more than {TORCHSCRIPT_TOLERANCE}: {diffs}")
+        
+        self.bert_engine = engine
+        return diffs
+    
+    def save_snapshot(self, path: str) -> Dict[str, Any]:
+        """
+        Save the ready-to-serve state to a warm-start snapshot
+        
+        Args:
+            path: Path to write the snapshot to
+            
+        Returns:
+            The snapshot header
+        """
+        from snapshot import save_snapshot
+        return save_snapshot(self, path)
+    
+    def memory_report(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Break down the memory held by each component of the advisor
+        
+        Args:
+            extra: Additional named objects to measure, such as web caches
+            
+        Returns:
+            Dictionary mapping component names to sizes in bytes, each object counted once
+        """
+        # Components share one set of counted objects, so an object referenced by several
+        # (e.g. the indexes held by the weight sweeper) counts once, for the first listed
+        seen = set()
+        report = {
+            'model_parameters': module_bytes(self.model) if self.model is not None else 0,
+            'tokenizer_vocabulary': tokenizer_bytes(self.tokenizer) if self.tokenizer is not None else 0,
+            'onet_data': deep_sizeof(self.onet_data, seen),
+            'college_data': deep_sizeof(self.college_data, seen),
+            'resources_data': deep_sizeof(self.resources_data, seen),
+            'career_engine': deep_sizeof(self.career_engine, seen),
+            'university_index': deep_sizeof(self.university_index, seen),
+            'weight_sweeper': deep_sizeof(self.weight_sweeper, seen),
+            'subject_matcher': deep_sizeof(self.subject_matcher, seen) if self.subject_matcher is not None else 0,
+            'subject_index': deep_sizeof(self.subject_index, seen) if self.subject_index is not None else 0,
+            'plan_planner': deep_sizeof(self.plan_planner.plans, seen),
+            # A loaded matrix is memory-mapped, so count its full size as it pages in on search
+            'career_index': (deep_sizeof(self.career_index.records, seen) + self.career_index.vectors.nbytes
+                             if self.career_index is not None else 0)
+        }
+        if self.bert_engine is not None:
+            # Frozen graphs hold their weights as constants, so use the artifact sizes
+            report['torchscript_graphs'] = sum(os.path.getsize(self.bert_engine._artifact_path(bucket))
+                                               for bucket in self.bert_engine.graphs)
+        for name, obj in (extra or {}).items():
+            report[name] = deep_sizeof(obj, seen)
+        return report
     
     def get_bert_embedding(self, text: str) -> np.ndarray:
-        """Get BERT embedding for a given text"""
-        inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512).to(device)
+        """
+        Get BERT embedding for a given text
+        
+        Raises:
+            AdmissionRejected: If the embedding path is saturated
+        """
+        with self.bert_admission.admit():
+            return self._bert_embedding(text)
+    
+    def _bert_embedding(self, text: str) -> np.ndarray:
+        import torch
+        if self.model is None:
+            raise RuntimeError("BERT model is not loaded")
+        
+        if self.bert_engine is not None:
+            embedding = self.bert_engine.embed(text)
+            if embedding is not None:
+                return embedding
+        
+        inputs = self.tokenizer(text, return_tensors="pt", padding=True, truncation=True, max_length=512).to(self.device)
         with torch.no_grad():
             outputs = self.model(**inputs)
         
@@ -246,6 +280,98 @@ class CareerAdvisorAI:
         embeddings = outputs.last_hidden_state[:, 0, :].cpu().numpy()
         return embeddings[0]
     
+    def get_bert_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Get BERT embeddings for several texts, running the model on padded batches
+        
+        Args:
+            texts: Texts to embed
+            batch_size: Number of texts per forward pass
+            
+        Returns:
+            Matrix of [CLS] embeddings (n_texts x dim)
+        
+        Raises:
+            AdmissionRejected: If the embedding path is saturated
+        """
+        import torch
+        if self.model is None:
+            raise RuntimeError("BERT model is not loaded")
+        
+        with self.bert_admission.admit():
+            if self.bert_engine is not None:
+                return np.stack([self._bert_embedding(text) for text in texts])
+            
+            embeddings = []
+            for start in range(0, len(texts), batch_size):
+                inputs = self.tokenizer(texts[start:start + batch_size], return_tensors="pt", padding=True,
+                                        truncation=True, max_length=512).to(self.device)
+                with torch.no_grad():
+                    outputs = self.model(**inputs)
+                embeddings.append(outputs.last_hidden_state[:, 0, :].cpu().numpy())
+            return np.concatenate(embeddings)
+    
+    def get_subject_embeddings(self) -> np.ndarray:
+        """Get BERT embeddings for every subject in the resources data, computing them on first use"""
+        if self.subject_embeddings is None:
+            self.subject_embeddings = np.stack([self.get_bert_embedding(subject)
+                                                for subject in self.resources_data['subject']])
+        return self.subject_embeddings
+    
+    def get_subject_index(self) -> 'SubjectIndex':
+        """Get the subject similarity index, building it on first use"""
+        if self.subject_index is None:
+            from subject_index import SubjectIndex
+            logger.info("Building subject index...")
+            dtype = np.float16 if self.subject_dimensions is not None else np.float32
+            self.subject_index = SubjectIndex(self.resources_data['subject'], self.get_subject_embeddings(),
+                                              n_components=self.subject_dimensions, dtype=dtype)
+        return self.subject_index
+    
+    def get_subject_matcher(self) -> 'TieredSubjectMatcher':
+        """Get the tiered subject matcher, building its n-gram index on first use"""
+        if self.subject_matcher is None:
+            from subject_matcher import TieredSubjectMatcher
+            # Match majors to subjects by name, alias and n-grams before falling back to BERT
+            self.subject_matcher = TieredSubjectMatcher(self.resources_data['subject'], self.match_subject_embedding)
+        return self.subject_matcher
+    
+    def match_subject_embedding(self, major: str) -> Tuple[str, float]:
+        """
+        Find the subject whose BERT embedding is closest to the major
+        
+        Args:
+            major: The major to match
+            
+        Returns:
+            Tuple of the best matching subject and its similarity score
+        """
+        major_embedding = self.get_bert_embedding(major)
+        return self.get_subject_index().search(major_embedding)
+    
+    def subject_index_report(self, queries: Optional[List[str]] = None, n_components: int = 128) -> Dict[str, Any]:
+        """
+        Compare a PCA-reduced float16 subject index with full-dimension search
+        
+        Args:
+            queries: Majors to search for (defaults to occupations and subjects)
+            n_components: Number of PCA dimensions for the reduced index
+            
+        Returns:
+            Dictionary with memory saved, speedup and top-1 agreement
+        """
+        from subject_index import SubjectIndex, compare_indexes
+        if queries is None:
+            queries = list(self.onet_data['occupation']) + list(self.resources_data['subject'])
+        
+        subjects = self.resources_data['subject']
+        embeddings = self.get_subject_embeddings()
+        full_index = SubjectIndex(subjects, embeddings)
+        reduced_index = SubjectIndex(subjects, embeddings, n_components=n_components, dtype=np.float16)
+        query_embeddings = np.stack([self.get_bert_embedding(query) for query in queries])
+        
+        return compare_indexes(full_index, reduced_index, query_embeddings)
+    
     def assess_personality(self, answers: Dict[str, int]) -> Dict[str, float]:
         """
         Assess personality traits based on answers
@@ -256,18 +382,7 @@ class CareerAdvisorAI:
         Returns:
             Dictionary mapping traits to scores
         """
-        traits = {}
-        for question in self.personality_questions:
-            qid = question["id"]
-            trait = question["trait"]
-            if qid in answers:
-                if trait not in traits:
-                    traits[trait] = []
-                traits[trait].append(answers[qid])
-        
-        # Average the scores for each trait
-        trait_scores = {trait: sum(scores)/len(scores) for trait, scores in traits.items()}
-        return trait_scores
+        return self.personality_bank.score(answers)
     
     def assess_interests(self, answers: Dict[str, int]) -> Dict[str, float]:
         """
@@ -279,18 +394,23 @@ class CareerAdvisorAI:
         Returns:
             Dictionary mapping subjects to scores
         """
-        interests = {}
-        for question in self.subject_interest_questions:
-            qid = question["id"]
-            subject = question["subject"]
-            if qid in answers:
-                if subject not in interests:
-                    interests[subject] = []
-                interests[subject].append(answers[qid])
+        return self.interest_bank.score(answers)
+    
+    def assess_batch(self, personality_answers: List[Dict[str, int]],
+                     interest_answers: List[Dict[str, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Assess the personality traits and subject interests of a batch of students
         
-        # Average the scores for each interest
-        interest_scores = {interest: sum(scores)/len(scores) for interest, scores in interests.items()}
-        return interest_scores
+        Args:
+            personality_answers: Personality answers for each student
+            interest_answers: Subject interest answers for each student
+        
+        Returns:
+            Tuple of trait scores (students x personality_bank.scales) and interest scores
+            (students x interest_bank.scales), NaN where a scale has no answered item
+        """
+        return (self.personality_bank.score_batch(personality_answers),
+                self.interest_bank.score_batch(interest_answers))
     
     def recommend_careers(self, trait_scores: Dict[str, float], interest_scores: Dict[str, float], top_n: int = 3) -> List[Dict[str, Any]]:
         """
@@ -306,55 +426,58 @@ class CareerAdvisorAI:
         """
         logger.info("Generating career recommendations...")
         
-        # Calculate match scores for each occupation
-        scores = []
-        for _, row in self.onet_data.iterrows():
-            occupation = row['occupation']
-            traits = row['personality_traits'].split(',')
-            interests = row['interests'].split(',')
-            
-            # Calculate trait match score
-            trait_match = 0
-            for trait in traits:
-                if trait in trait_scores:
-                    trait_match += trait_scores[trait]
-            trait_match = trait_match / len(traits) if traits else 0
-            
-            # Calculate interest match score
-            interest_match = 0
-            for interest in interests:
-                if interest in interest_scores:
-                    interest_match += interest_scores[interest]
-            interest_match = interest_match / len(interests) if interests else 0
-            
-            # Combined score (weighted average)
-            combined_score = 0.4 * trait_match + 0.6 * interest_match
-            
-            scores.append({
-                'occupation': occupation,
-                'description': row['description'],
-                'education_required': row['education_required'],
-                'score': combined_score
-            })
-        
-        # Sort by score and return top N
-        scores.sort(key=lambda x: x['score'], reverse=True)
-        return scores[:top_n]
+        # Walk the trait and interest posting lists until no unseen occupation can enter the top N
+        recommendations, stats = self.career_engine.search(trait_scores, interest_scores, top_n)
+        logger.info(f"Scored {stats['touched']} of {stats['total']} occupations")
+        return recommendations
     
-    def recommend_universities(self, career_recommendations: List[Dict[str, Any]], top_n: int = 3) -> List[Dict[str, Any]]:
+    def get_career_index(self) -> SemanticCareerIndex:
+        """Get the semantic occupation index, loading or building its persisted matrix on first use"""
+        if self.career_index is None:
+            records = self.career_engine.records
+            path = SemanticCareerIndex.cache_path(SEMANTIC_CACHE_DIR, f"{BERT_MODEL_NAME}@{self.model_revision}:"
+                                                                      f"{self.dataset_version}")
+            self.career_index = SemanticCareerIndex.load(records, path)
+            if self.career_index is None:
+                logger.info("Embedding occupation titles and descriptions...")
+                texts = [occupation_text(record['occupation'], record['description']) for record in records]
+                self.career_index = SemanticCareerIndex(records, self.get_bert_embeddings(texts))
+                self.career_index.save(path)
+        return self.career_index
+    
+    def recommend_careers_semantic(self, goals: List[str], top_n: int = 3,
+                                   profiles: Optional[List[Tuple[Dict[str, float], Dict[str, float]]]] = None,
+                                   profile_weight: float = DEFAULT_PROFILE_WEIGHT) -> List[List[Dict[str, Any]]]:
         """
-        Recommend universities based on career recommendations
+        Recommend careers for free-text goals by similarity to occupation descriptions
         
         Args:
-            career_recommendations: List of recommended careers
-            top_n: Number of top recommendations to return
+            goals: Goals described in the students' own words, one per student
+            top_n: Number of top recommendations per goal
+            profiles: Optional (trait_scores, interest_scores) per goal to blend with the similarity
+            profile_weight: Share of the trait and interest match in the blended score
             
         Returns:
-            List of recommended universities with details
+            For each goal, the recommended careers with their score, similarity and profile score
         """
-        logger.info("Generating university recommendations...")
-        
-        # Extract relevant fields from career recommendations
+        logger.info(f"Generating semantic career recommendations for {len(goals)} goals...")
+        career_index = self.get_career_index()
+        query_embeddings = self.get_bert_embeddings(goals)
+        
+        profile_scores = None
+        if profiles is not None:
+            if len(profiles) != len(goals):
+                raise ValueError(f"Expected {len(goals)} profiles, got {len(profiles)}")
+            # Weighted trait and interest match of every occupation, scaled to [0, 1]
+            profile_scores = np.column_stack([
+                self.weight_sweeper.career_components(trait_scores, interest_scores) @ np.array(CAREER_WEIGHTS)
+                for trait_scores, interest_scores in profiles
+            ]) / LIKERT_SCALE[1]
+        
+        return career_index.search(query_embeddings, top_n, profile_scores, profile_weight)
+    
+    def recommended_fields(self, career_recommendations: List[Dict[str, Any]]) -> set:
+        """Extract the fields of study relevant to the recommended careers"""
         recommended_fields = set()
         for career in career_recommendations:
             education = career['education_required']
@@ -374,66 +497,90 @@ class CareerAdvisorAI:
                 recommended_fields.add("Engineering")
             elif "Business" in education:
                 recommended_fields.add("Business")
+        return recommended_fields
+    
+    def recommend_universities(self, career_recommendations: List[Dict[str, Any]], top_n: int = 3,
+                               state: Optional[str] = None, max_cost: Optional[float] = None,
+                               min_graduation_rate: Optional[float] = None,
+                               required_programs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Recommend universities based on career recommendations
         
-        # Calculate match scores for each university
-        scores = []
-        for _, row in self.college_data.iterrows():
-            university = row['university']
-            programs = set(row['programs'].split(','))
-            
-            # Calculate program match score
-            program_match = len(programs.intersection(recommended_fields)) / len(recommended_fields) if recommended_fields else 0
+        Args:
+            career_recommendations: List of recommended careers
+            top_n: Number of top recommendations to return
+            state: Only recommend universities in this state (or list of states)
+            max_cost: Maximum annual cost
+            min_graduation_rate: Minimum graduation rate (0-1)
+            required_programs: Programs a university must offer
             
-            # Other factors (could be weighted based on user preferences)
-            cost_score = 1 - (row['cost'] / 60000)  # Normalize cost (lower is better)
-            acceptance_score = row['acceptance_rate']  # Higher acceptance rate is better for accessibility
-            graduation_score = row['graduation_rate']  # Higher graduation rate is better
+        Returns:
+            List of recommended universities with details
+        """
+        logger.info("Generating university recommendations...")
+        
+        recommended_fields = self.recommended_fields(career_recommendations)
+        
+        # Filter with the secondary indexes, then score and rank the remaining universities
+        return self.university_index.recommend(recommended_fields, top_n=top_n,
+                                               state=state,
+                                               max_cost=max_cost,
+                                               min_graduation_rate=min_graduation_rate,
+                                               required_programs=required_programs)
+    
+    def sweep_career_weights(self, trait_scores: Dict[str, float], interest_scores: Dict[str, float],
+                             weight_grid: List[List[float]], top_n: int = 3) -> List[Dict[str, Any]]:
+        """
+        Rank careers for a grid of (trait, interest) weight vectors in one pass
+        
+        Args:
+            trait_scores: Dictionary mapping traits to scores
+            interest_scores: Dictionary mapping interests to scores
+            weight_grid: Weight vectors, one (trait, interest) pair per row
+            top_n: Number of top recommendations per weight vector
             
-            # Combined score (weighted average)
-            combined_score = 0.5 * program_match + 0.2 * cost_score + 0.1 * acceptance_score + 0.2 * graduation_score
+        Returns:
+            List with the weights, ranked occupations and scores for each weight vector
+        """
+        return self.weight_sweeper.sweep_careers(trait_scores, interest_scores, weight_grid, top_n)
+    
+    def sweep_university_weights(self, career_recommendations: List[Dict[str, Any]], weight_grid: List[List[float]],
+                                 top_n: int = 3, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Rank universities for a grid of (program, cost, acceptance, graduation) weight vectors in one pass
+        
+        Args:
+            career_recommendations: List of recommended careers
+            weight_grid: Weight vectors, one 4-tuple per row
+            top_n: Number of top recommendations per weight vector
+            **filters: Constraints accepted by recommend_universities
             
-            scores.append({
-                'university': university,
-                'location': row['location'],
-                'programs': row['programs'],
-                'cost': row['cost'],
-                'acceptance_rate': row['acceptance_rate'],
-                'graduation_rate': row['graduation_rate'],
-                'score': combined_score
-            })
-        
-        # Sort by score and return top N
-        scores.sort(key=lambda x: x['score'], reverse=True)
-        return scores[:top_n]
-    
-    def generate_study_plan(self, major: str) -> Dict[str, Any]:
+        Returns:
+            List with the weights, ranked universities and scores for each weight vector
+        """
+        filter_mask = self.university_index.filter(**filters) if filters else None
+        return self.weight_sweeper.sweep_universities(self.recommended_fields(career_recommendations),
+                                                      weight_grid, top_n, filter_mask)
+    
+    def generate_study_plan(self, major: str, degraded: bool = False) -> Dict[str, Any]:
         """
         Generate a study plan for a given major
         
         Args:
             major: The major to generate a study plan for
+            degraded: Skip the BERT tier and use the best n-gram match (for overload)
             
         Returns:
             Dictionary containing study plan details
+            
+        Raises:
+            AdmissionRejected: If BERT is needed and the embedding path is saturated
         """
         logger.info(f"Generating study plan for {major}...")
         
         # Find the closest matching subject in our resources data
-        major_embedding = self.get_bert_embedding(major)
-        subject_embeddings = {}
-        
-        for subject in self.resources_data['subject']:
-            subject_embedding = self.get_bert_embedding(subject)
-            subject_embeddings[subject] = subject_embedding
-        
-        # Calculate similarity scores
-        similarities = {}
-        for subject, embedding in subject_embeddings.items():
-            similarity = cosine_similarity([major_embedding], [embedding])[0][0]
-            similarities[subject] = similarity
-        
-        # Get the most similar subject
-        best_match = max(similarities.items(), key=lambda x: x[1])[0]
+        match = self.get_subject_matcher().match(major, allow_embedding=not degraded)
+        best_match = match['subject']
         
         # Get resources for the best matching subject
         resources = self.resources_data[self.resources_data['subject'] == best_match].iloc[0]
@@ -442,6 +589,7 @@ class CareerAdvisorAI:
         study_plan = {
             "major": major,
             "matched_subject": best_match,
+            "match_tier": match['tier'],
             "resources": {
                 "books": resources['books'].split(','),
                 "courses": resources['courses'].split(','),
@@ -473,6 +621,30 @@ class CareerAdvisorAI:
         
         return study_plan
     
+    def precompute_study_plans(self, career_recommendations: List[Dict[str, Any]]) -> List[Tuple[str, int]]:
+        """
+        Start generating study plans for the recommended careers in the background
+        
+        Args:
+            career_recommendations: List of recommended careers
+            
+        Returns:
+            Claims on the queued plans, to release with plan_planner.cancel()
+        """
+        return self.plan_planner.submit(career['occupation'] for career in career_recommendations)
+    
+    def get_study_plan(self, major: str) -> Dict[str, Any]:
+        """
+        Get a study plan for a major, using the precomputed plan if there is one
+        
+        Args:
+            major: The major to get a study plan for
+            
+        Returns:
+            Dictionary containing study plan details
+        """
+        return self.plan_planner.get(major)
+    
     def run_assessment(self) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
         """
         Run the full assessment process
@@ -574,6 +746,9 @@ class CareerAdvisorAI:
         career_recommendations = self.recommend_careers(trait_scores, interest_scores)
         university_recommendations = self.recommend_universities(career_recommendations)
         
+        # Prepare study plans for the recommended careers while the user reads the results
+        self.precompute_study_plans(career_recommendations)
+        
         # Display results
         print("\n--- Your Personality Traits ---")
         for trait, score in trait_scores.items():
@@ -600,9 +775,11 @@ class CareerAdvisorAI:
         while True:
             major = input("\nEnter a major to get a study plan (or 'quit' to exit): ")
             if major.lower() == 'quit':
+                self.plan_planner.cancel()
+                logger.info(f"Speculative study plans: {self.plan_planner.stats()}")
                 break
             
-            study_plan = self.generate_study_plan(major)
+            study_plan = self.get_study_plan(major)
             
             print(f"\n--- Study Plan for {major} ---")
             print(f"Matched Subject: {study_plan['matched_subject']}")
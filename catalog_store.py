@@ -0,0 +1,141 @@
+import pandas as pd
+import numpy as np
+import json
+import os
+import time
+from typing import List, Dict, Any, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+CATALOG_FORMAT_VERSION = 1
+
+# Datasets shared by the DataProcessor and the advisor
+CATALOG_DATASETS = ('onet_data', 'college_data', 'resources_data')
+
+
+class CatalogStore:
+    """
+    Typed columnar store for the catalog datasets: one directory per dataset holding a
+    .npy file per numeric column, offsets plus UTF-8 data per string column and a manifest
+    """
+
+    def __init__(self, root: str = os.path.join("data", "catalog")):
+        """
+        Initialize the CatalogStore
+
+        Args:
+            root: Directory holding the datasets
+        """
+        self.root = root
+        self.report: Dict[str, Dict[str, Any]] = {}
+
+    def _path(self, name: str, *parts: str) -> str:
+        return os.path.join(self.root, name, *parts)
+
+    @staticmethod
+    def _save(path: str, write) -> None:
+        # Write next to the target and rename so readers never see partial files
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def exists(self, name: str) -> bool:
+        """Whether a complete copy of the dataset is in the store"""
+        return os.path.exists(self._path(name, "manifest.json"))
+
+    def write(self, name: str, data: pd.DataFrame) -> None:
+        """
+        Write a dataset to the store
+
+        Args:
+            name: Dataset name
+            data: DataFrame to store
+        """
+        os.makedirs(self._path(name), exist_ok=True)
+        # Remove the manifest first so a crash mid-write leaves the dataset missing, not mixed
+        if self.exists(name):
+            os.remove(self._path(name, "manifest.json"))
+
+        columns = []
+        for index, column in enumerate(data.columns):
+            values = data[column]
+            stem = f"{index:03d}"
+            if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values):
+                array = np.ascontiguousarray(values.to_numpy())
+                self._save(self._path(name, f"{stem}.npy"), lambda f: np.save(f, array))
+                columns.append({'name': column, 'kind': 'numeric', 'file': f"{stem}.npy", 'dtype': array.dtype.str})
+            else:
+                encoded = [str(value).encode('utf-8') for value in values]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                offsets[1:] = np.cumsum([len(value) for value in encoded])
+                self._save(self._path(name, f"{stem}.offsets.npy"), lambda f: np.save(f, offsets))
+                self._save(self._path(name, f"{stem}.data"), lambda f: f.write(b''.join(encoded)))
+                columns.append({'name': column, 'kind': 'string', 'file': f"{stem}.data",
+                                'offsets': f"{stem}.offsets.npy"})
+
+        manifest = {'format_version': CATALOG_FORMAT_VERSION, 'rows': len(data), 'columns': columns}
+        self._save(self._path(name, "manifest.json"), lambda f: f.write(json.dumps(manifest, indent=2).encode('utf-8')))
+        logger.info(f"Catalog dataset {name} written to {self._path(name)}")
+
+    def write_all(self, datasets: Dict[str, pd.DataFrame]) -> None:
+        """Write several datasets to the store"""
+        for name, data in datasets.items():
+            self.write(name, data)
+
+    def open(self, name: str) -> pd.DataFrame:
+        """
+        Open a dataset from the store
+
+        Numeric columns are memory-mapped and wrapped without copying; string columns
+        are decoded from one contiguous UTF-8 buffer.
+
+        Args:
+            name: Dataset name
+
+        Returns:
+            DataFrame with the dataset
+
+        Raises:
+            FileNotFoundError: If the dataset is not in the store
+            ValueError: If the dataset was written by an unsupported format version
+        """
+        start = time.perf_counter()
+        with open(self._path(name, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get('format_version') != CATALOG_FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalog format version {manifest.get('format_version')} for {name}")
+
+        columns = {}
+        file_bytes = 0
+        for column in manifest['columns']:
+            if column['kind'] == 'numeric':
+                array = np.load(self._path(name, column['file']), mmap_mode='r')
+                file_bytes += array.nbytes
+                columns[column['name']] = array
+            else:
+                offsets = np.load(self._path(name, column['offsets']), mmap_mode='r')
+                with open(self._path(name, column['file']), 'rb') as f:
+                    data = f.read()
+                file_bytes += offsets.nbytes + len(data)
+                columns[column['name']] = [data[begin:end].decode('utf-8')
+                                           for begin, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+        frame = pd.DataFrame(columns, copy=False)
+        self.report[name] = {
+            'rows': manifest['rows'],
+            'seconds': time.perf_counter() - start,
+            'file_bytes': file_bytes,
+            'frame_bytes': int(frame.memory_usage(index=True, deep=True).sum())
+        }
+        logger.info(f"Opened catalog dataset {name}: {manifest['rows']} rows in "
+                    f"{self.report[name]['seconds'] * 1000:.2f} ms, {file_bytes} bytes on disk, "
+                    f"{self.report[name]['frame_bytes']} bytes in memory")
+        return frame
+
+    def open_all(self, names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Open several datasets from the store (defaults to CATALOG_DATASETS)"""
+        return {name: self.open(name) for name in (names or CATALOG_DATASETS)}
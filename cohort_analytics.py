@@ -0,0 +1,255 @@
+import pandas as pd
+import numpy as np
+import argparse
+import json
+import os
+from typing import List, Dict, Any, Iterator, Optional
+import logging
+from catalog_store import CatalogStore
+from question_bank import QuestionBank, LIKERT_SCALE, PERSONALITY_QUESTIONS, SUBJECT_INTEREST_QUESTIONS
+from topk_engine import CareerTopKEngine
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Students read from an answer file at a time
+DEFAULT_CHUNK_SIZE = 10000
+
+# Score used for a scale the student left unanswered
+NEUTRAL_SCORE = sum(LIKERT_SCALE) / 2
+
+
+def iter_answer_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream an answer file in chunks of students
+
+    CSV files have one column per question ID. JSON Lines files have one object per
+    student, either mapping question IDs to answers or holding them under
+    "personality_answers" and "interest_answers".
+
+    Args:
+        path: Path of a .csv or .jsonl answer file
+        chunk_size: Number of students per chunk
+
+    Returns:
+        Iterator over DataFrames with one row per student and one column per question ID
+    """
+    if path.endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if 'personality_answers' in record or 'interest_answers' in record:
+                record = {**record.get('personality_answers', {}), **record.get('interest_answers', {})}
+            rows.append(record)
+            if len(rows) == chunk_size:
+                yield pd.DataFrame(rows)
+                rows = []
+    if rows:
+        yield pd.DataFrame(rows)
+
+
+class CohortClusterer:
+    """
+    Groups students by their combined trait and interest scores with mini-batch k-means,
+    streaming answer files so memory does not grow with the number of students
+    """
+
+    def __init__(self, n_clusters: int = 8, chunk_size: int = DEFAULT_CHUNK_SIZE, seed: int = 0):
+        """
+        Initialize the CohortClusterer
+
+        Args:
+            n_clusters: Number of cohorts
+            chunk_size: Number of students scored and fitted at a time
+            seed: Random seed for k-means
+        """
+        from sklearn.cluster import MiniBatchKMeans
+        self.n_clusters = n_clusters
+        self.chunk_size = chunk_size
+        self.personality_bank = QuestionBank(PERSONALITY_QUESTIONS, 'trait')
+        self.interest_bank = QuestionBank(SUBJECT_INTEREST_QUESTIONS, 'subject')
+        self.kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=min(chunk_size, 4096),
+                                      random_state=seed, n_init=1)
+        self.sizes = np.zeros(n_clusters, dtype=np.int64)
+        self.students = 0
+
+    def vectors(self, chunk: pd.DataFrame) -> np.ndarray:
+        """
+        Score a chunk of students into combined trait and interest vectors
+
+        Args:
+            chunk: Answers with one column per question ID
+
+        Returns:
+            Matrix of trait then interest scores (students x scales), unanswered scales neutral
+        """
+        scores = []
+        for bank in (self.personality_bank, self.interest_bank):
+            values = chunk.reindex(columns=bank.item_ids).apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+            scores.append(bank.score_matrix(*bank.mask(values)))
+        vectors = np.hstack(scores)
+        return np.where(np.isnan(vectors), NEUTRAL_SCORE, vectors)
+
+    def _chunks(self, paths: List[str]) -> Iterator[np.ndarray]:
+        for path in paths:
+            for chunk in iter_answer_chunks(path, self.chunk_size):
+                yield self.vectors(chunk)
+
+    def fit(self, paths: List[str], epochs: int = 1) -> 'CohortClusterer':
+        """
+        Fit the cohorts incrementally over the answer files
+
+        Args:
+            paths: Answer files to stream
+            epochs: Number of passes over the files
+
+        Returns:
+            The fitted clusterer
+        """
+        for epoch in range(epochs):
+            logger.info(f"Fitting cohorts, pass {epoch + 1} of {epochs}...")
+            pending = []
+            for vectors in self._chunks(paths):
+                # The first partial fit needs at least one student per cluster
+                pending.append(vectors)
+                if sum(len(block) for block in pending) >= self.n_clusters:
+                    self.kmeans.partial_fit(np.vstack(pending))
+                    pending = []
+            if pending:
+                if not hasattr(self.kmeans, 'cluster_centers_'):
+                    raise ValueError(f"Need at least {self.n_clusters} students to fit {self.n_clusters} cohorts")
+                self.kmeans.partial_fit(np.vstack(pending))
+        return self
+
+    def assign(self, paths: List[str]) -> np.ndarray:
+        """
+        Count the students in each cohort
+
+        Args:
+            paths: Answer files to stream
+
+        Returns:
+            Number of students per cohort
+        """
+        logger.info("Assigning students to cohorts...")
+        self.sizes = np.zeros(self.n_clusters, dtype=np.int64)
+        for vectors in self._chunks(paths):
+            self.sizes += np.bincount(self.kmeans.predict(vectors), minlength=self.n_clusters)
+        self.students = int(self.sizes.sum())
+        return self.sizes
+
+    def centroid_scores(self, cluster: int) -> Dict[str, Dict[str, float]]:
+        """Trait and interest scores of a cohort centroid"""
+        centroid = self.kmeans.cluster_centers_[cluster]
+        n_traits = len(self.personality_bank.scales)
+        return {
+            'traits': dict(zip(self.personality_bank.scales, centroid[:n_traits].tolist())),
+            'interests': dict(zip(self.interest_bank.scales, centroid[n_traits:].tolist()))
+        }
+
+    def report(self, career_engine: CareerTopKEngine, top_n: int = 3) -> Dict[str, Any]:
+        """
+        Summarize the cohorts with their centroids, sizes and top recommended careers
+
+        Args:
+            career_engine: Career posting lists to recommend careers from
+            top_n: Number of careers per cohort
+
+        Returns:
+            Dictionary with the number of students and one entry per cohort, largest first
+        """
+        cohorts = []
+        for cluster in np.argsort(-self.sizes, kind='stable'):
+            centroid = self.centroid_scores(int(cluster))
+            careers, _ = career_engine.search(centroid['traits'], centroid['interests'], top_n)
+            cohorts.append({
+                'cohort': int(cluster),
+                'size': int(self.sizes[cluster]),
+                'share': float(self.sizes[cluster] / self.students) if self.students else 0.0,
+                'centroid': centroid,
+                'top_careers': [{'occupation': career['occupation'], 'score': career['score']} for career in careers]
+            })
+        return {'students': self.students, 'cohorts': cohorts}
+
+
+def load_career_engine(data_dir: str = "data") -> CareerTopKEngine:
+    """Build the career posting lists from the catalog, preparing it if needed"""
+    catalog = CatalogStore(os.path.join(data_dir, "catalog"))
+    if not catalog.exists('onet_data'):
+        from data_processor import DataProcessor
+        DataProcessor(data_dir).prepare_all_datasets()
+    return CareerTopKEngine(catalog.open('onet_data'))
+
+
+def run_cohort_analysis(paths: List[str], output: str, n_clusters: int = 8, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        epochs: int = 1, top_n: int = 3, data_dir: str = "data", seed: int = 0) -> Dict[str, Any]:
+    """
+    Cluster the students in the answer files and write the cohort report
+
+    Args:
+        paths: Answer files to stream
+        output: Path of the JSON report
+        n_clusters: Number of cohorts
+        chunk_size: Number of students scored and fitted at a time
+        epochs: Number of fitting passes over the files
+        top_n: Number of careers per cohort
+        data_dir: Directory holding the catalog
+        seed: Random seed for k-means
+
+    Returns:
+        The cohort report
+    """
+    clusterer = CohortClusterer(n_clusters, chunk_size, seed).fit(paths, epochs)
+    clusterer.assign(paths)
+    report = clusterer.report(load_career_engine(data_dir), top_n)
+
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Wrote {n_clusters} cohorts for {report['students']} students to {output}")
+    return report
+
+
+def build_parser(parser: Optional[argparse.ArgumentParser] = None) -> argparse.ArgumentParser:
+    """Add the cohort analysis arguments to a parser"""
+    parser = parser or argparse.ArgumentParser(description='Cluster students into cohorts by trait and interest scores')
+    parser.add_argument('answers', nargs='+', help='Answer files (.csv with one column per question ID, or .jsonl)')
+    parser.add_argument('--output', default='cohorts.json', help='Path of the JSON cohort report')
+    parser.add_argument('--clusters', type=int, default=8, help='Number of cohorts')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Students read and fitted at a time')
+    parser.add_argument('--epochs', type=int, default=1, help='Fitting passes over the answer files')
+    parser.add_argument('--top-careers', type=int, default=3, help='Careers recommended per cohort')
+    parser.add_argument('--data-dir', default='data', help='Directory holding the catalog')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    return parser
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a cohort report"""
+    print(f"\n--- Cohorts: {report['students']} students ---")
+    for cohort in report['cohorts']:
+        traits = sorted(cohort['centroid']['traits'].items(), key=lambda item: -item[1])[:3]
+        interests = sorted(cohort['centroid']['interests'].items(), key=lambda item: -item[1])[:3]
+        print(f"\nCohort {cohort['cohort']}: {cohort['size']} students ({cohort['share'] * 100:.1f}%)")
+        print(f"   Traits: {', '.join(f'{name} {score:.2f}' for name, score in traits)}")
+        print(f"   Interests: {', '.join(f'{name} {score:.2f}' for name, score in interests)}")
+        print(f"   Careers: {', '.join(career['occupation'] for career in cohort['top_careers'])}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Command-line entry point for the cohort analysis"""
+    args = build_parser().parse_args(argv)
+    print_report(run_cohort_analysis(args.answers, args.output, args.clusters, args.chunk_size, args.epochs,
+                                     args.top_careers, args.data_dir, args.seed))
+
+
+# Example usage
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import json
 import os
 from typing import Dict, List, Any
 import logging
+from catalog_store import CatalogStore
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -24,6 +25,9 @@ class DataProcessor:
         """
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
+        
+        # Typed columnar copies of the datasets, opened by CareerAdvisorAI
+        self.catalog = CatalogStore(os.path.join(data_dir, "catalog"))
         logger.info(f"DataProcessor initialized with data directory: {data_dir}")
     
     def download_onet_data(self) -> pd.DataFrame:
@@ -190,6 +194,7 @@ class DataProcessor:
             'college_data': college_data,
             'resources_data': resources_data
         }
+        self.catalog.write_all(datasets)
         
         logger.info("All datasets prepared successfully")
         return datasets
@@ -0,0 +1,130 @@
+from flask import Response, make_response, render_template, request
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Union
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_directory(path: str) -> str:
+    """Compute a content hash of every file under a directory"""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, path).encode('utf-8'))
+            with open(file_path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class HTTPCache:
+    """
+    Rendered-fragment cache and conditional request handling (ETag/Last-Modified)
+    for responses that only depend on the dataset, model and template versions
+    """
+
+    def __init__(self, version: str, last_modified: float, max_entries: int = 1024):
+        """
+        Initialize the HTTPCache
+
+        Args:
+            version: Version string the validators are derived from
+            last_modified: Timestamp of the last change to the cached content
+            max_entries: Maximum number of memoized values to keep
+        """
+        self.version = version
+        self.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+        self.max_entries = max_entries
+        self.fragments: Dict[str, str] = {}
+        self.values: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def etag(self, *parts: str) -> str:
+        """Derive an entity tag from the cache version and the given key parts"""
+        digest = hashlib.sha256(self.version.encode('utf-8'))
+        for part in parts:
+            digest.update(b'\0' + part.encode('utf-8'))
+        return digest.hexdigest()[:32]
+
+    def render_cached(self, template_name: str, **context: Any) -> str:
+        """
+        Render a template whose context never changes once, then serve the cached HTML
+
+        Args:
+            template_name: Name of the template to render
+            **context: Template context
+
+        Returns:
+            The rendered HTML
+        """
+        html = self.fragments.get(template_name)
+        if html is None:
+            html = render_template(template_name, **context)
+            with self._lock:
+                self.fragments[template_name] = html
+        return html
+
+    def memoize(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for a key, computing and storing it on a miss
+
+        Args:
+            key: Cache key
+            compute: Function producing the value
+
+        Returns:
+            The cached or newly computed value
+        """
+        with self._lock:
+            if key in self.values:
+                self.values.move_to_end(key)
+                return self.values[key]
+
+        value = compute()
+        with self._lock:
+            self.values[key] = value
+            self.values.move_to_end(key)
+            while len(self.values) > self.max_entries:
+                self.values.popitem(last=False)
+        return value
+
+    def is_fresh(self, etag: str) -> bool:
+        """Whether the current request already holds the representation with this ETag"""
+        if request.if_none_match:
+            return request.if_none_match.contains(etag)
+        # If-Modified-Since only applies to GET and HEAD (RFC 9110), and Last-Modified is
+        # shared by every representation, so it cannot tell apart POST bodies such as majors
+        if request.method in ('GET', 'HEAD') and request.if_modified_since is not None:
+            return self.last_modified <= request.if_modified_since
+        return False
+
+    def conditional_response(self, etag: str, build: Callable[[], Union[str, Response]]) -> Response:
+        """
+        Answer with 304 Not Modified when the client's validators match, otherwise build the response
+
+        Args:
+            etag: Entity tag of the representation
+            build: Function producing the response body or Response
+
+        Returns:
+            The response with ETag set, and Last-Modified for GET and HEAD requests
+        """
+        if self.is_fresh(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(build())
+
+        response.set_etag(etag)
+        if request.method in ('GET', 'HEAD'):
+            response.last_modified = self.last_modified
+        # Clients may store the response but must revalidate it on every use
+        response.cache_control.no_cache = True
+        return response
@@ -0,0 +1,228 @@
+import numpy as np
+import argparse
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Majors submitted to /study-plan: exact subjects, aliases, typos and free text
+DEFAULT_MAJORS = [
+    'Computer Science', 'computer science', 'Data Science', 'Medicine', 'Law', 'Accounting',
+    'Software Developer', 'Data Scientist', 'Doctor', 'Teacher', 'Lawyer', 'Accountant',
+    'Computer Sciense', 'pre-med', 'machine learning', 'marine biology', 'film studies'
+]
+
+QUESTION_ID_PATTERN = re.compile(r'type="radio" name="([^"]+)"')
+
+
+class InProcessClient:
+    """Drives the Flask app through its test client, keeping session cookies"""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def get(self, path: str) -> Tuple[int, str]:
+        response = self.client.get(path)
+        return response.status_code, response.get_data(as_text=True)
+
+    def post(self, path: str, data: Dict[str, Any]) -> Tuple[int, str]:
+        response = self.client.post(path, data=data)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class HTTPClient:
+    """Drives a running server over HTTP, keeping session cookies"""
+
+    def __init__(self, base_url: str):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def get(self, path: str) -> Tuple[int, str]:
+        response = self.session.get(self.base_url + path, allow_redirects=False)
+        return response.status_code, response.text
+
+    def post(self, path: str, data: Dict[str, Any]) -> Tuple[int, str]:
+        response = self.session.post(self.base_url + path, data=data, allow_redirects=False)
+        return response.status_code, response.text
+
+
+class LoadGenerator:
+    """
+    Replays the assessment journey (landing page, both questionnaires, results and a
+    study plan) with randomized answers and records per-route latencies
+    """
+
+    def __init__(self, client_factory, majors: Optional[List[str]] = None, seed: int = 0):
+        """
+        Initialize the LoadGenerator
+
+        Args:
+            client_factory: Callable returning a new client with its own cookie jar
+            majors: Majors to request study plans for
+            seed: Random seed for answers and arrivals
+        """
+        self.client_factory = client_factory
+        self.majors = majors or DEFAULT_MAJORS
+        self.rng = random.Random(seed)
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.queue_delays: List[float] = []
+        self._lock = threading.Lock()
+        self.personality_ids, self.interest_ids = self.discover_questions()
+
+    def discover_questions(self) -> Tuple[List[str], List[str]]:
+        """Read the question IDs from the questionnaire pages"""
+        client = self.client_factory()
+        _, html = client.get('/assessment/personality')
+        personality_ids = list(dict.fromkeys(QUESTION_ID_PATTERN.findall(html)))
+        client.post('/assessment/personality', {qid: 3 for qid in personality_ids})
+        _, html = client.get('/assessment/interests')
+        interest_ids = list(dict.fromkeys(QUESTION_ID_PATTERN.findall(html)))
+        logger.info(f"Found {len(personality_ids)} personality and {len(interest_ids)} interest questions")
+        return personality_ids, interest_ids
+
+    def _record(self, route: str, seconds: float, status: int) -> None:
+        with self._lock:
+            self.latencies.setdefault(route, []).append(seconds)
+            if status >= 400:
+                self.errors[route] = self.errors.get(route, 0) + 1
+
+    def _timed(self, route: str, call, *args, start: Optional[float] = None) -> Tuple[int, str]:
+        start = time.perf_counter() if start is None else start
+        status, body = call(*args)
+        self._record(route, time.perf_counter() - start, status)
+        return status, body
+
+    def run_journey(self, seed: int, arrival: Optional[float] = None) -> None:
+        """
+        Run one user journey with its own session cookies
+
+        Args:
+            seed: Random seed for the answers and major
+            arrival: Scheduled arrival time (perf_counter), from which the first request is timed
+        """
+        if arrival is not None:
+            # Time spent waiting for a free worker counts towards the first request's latency
+            with self._lock:
+                self.queue_delays.append(max(0.0, time.perf_counter() - arrival))
+        rng = random.Random(seed)
+        client = self.client_factory()
+        self._timed('GET /', client.get, '/', start=arrival)
+        self._timed('POST /assessment/personality', client.post, '/assessment/personality',
+                    {qid: rng.randint(1, 5) for qid in self.personality_ids})
+        self._timed('POST /assessment/interests', client.post, '/assessment/interests',
+                    {qid: rng.randint(1, 5) for qid in self.interest_ids})
+        self._timed('GET /results', client.get, '/results')
+        self._timed('POST /study-plan', client.post, '/study-plan', {'major': rng.choice(self.majors)})
+
+    def run(self, journeys: int, concurrency: int, rate: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run the load test
+
+        Args:
+            journeys: Number of user journeys to run
+            concurrency: Maximum number of concurrent journeys
+            rate: Journey arrival rate per second (Poisson), or None to start them as fast as possible
+
+        Returns:
+            Report with throughput and latency percentiles per route. With a rate, the first
+            request of a journey is timed from its scheduled arrival, and the time journeys
+            waited for a free worker is also reported as the queue delay
+        """
+        logger.info(f"Running {journeys} journeys with concurrency {concurrency}"
+                    f"{f' at {rate}/s' if rate else ''}...")
+        self.latencies, self.errors, self.queue_delays = {}, {}, []
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            next_arrival = start
+            futures = []
+            for _ in range(journeys):
+                arrival = None
+                if rate:
+                    next_arrival += self.rng.expovariate(rate)
+                    delay = next_arrival - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                    arrival = next_arrival
+                futures.append(pool.submit(self.run_journey, self.rng.randrange(2 ** 32), arrival))
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        return self.report(journeys, elapsed)
+
+    def report(self, journeys: int, elapsed: float) -> Dict[str, Any]:
+        """Summarize the recorded latencies"""
+        routes = {}
+        for route, latencies in self.latencies.items():
+            p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+            routes[route] = {
+                'requests': len(latencies),
+                'errors': self.errors.get(route, 0),
+                'throughput': len(latencies) / elapsed,
+                'p50_ms': p50,
+                'p95_ms': p95,
+                'p99_ms': p99
+            }
+        total_requests = sum(route['requests'] for route in routes.values())
+        report = {
+            'journeys': journeys,
+            'elapsed_seconds': elapsed,
+            'throughput': total_requests / elapsed,
+            'journeys_per_second': journeys / elapsed,
+            'routes': routes
+        }
+        if self.queue_delays:
+            p50, p95, p99 = np.percentile(np.array(self.queue_delays) * 1000, [50, 95, 99])
+            report['queue_delay'] = {'p50_ms': p50, 'p95_ms': p95, 'p99_ms': p99,
+                                     'max_ms': max(self.queue_delays) * 1000}
+        return report
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print a load test report"""
+    print(f"\n--- Load Test: {report['journeys']} journeys in {report['elapsed_seconds']:.2f}s ---")
+    print(f"Throughput: {report['throughput']:.1f} req/s ({report['journeys_per_second']:.1f} journeys/s)")
+    print(f"\n{'Route':<32}{'Reqs':>7}{'Errs':>6}{'Req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, stats in report['routes'].items():
+        print(f"{route:<32}{stats['requests']:>7}{stats['errors']:>6}{stats['throughput']:>9.1f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+    if 'queue_delay' in report:
+        delay = report['queue_delay']
+        print(f"\nQueue delay before a worker picked up a journey (included in GET / above): "
+              f"p50 {delay['p50_ms']:.2f} ms, p95 {delay['p95_ms']:.2f} ms, p99 {delay['p99_ms']:.2f} ms, "
+              f"max {delay['max_ms']:.2f} ms")
+
+
+# Example usage
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load generator for the Career Advisor AI web app')
+    parser.add_argument('--url', default=None, help='Base URL of a running server (default: drive the app in process)')
+    parser.add_argument('--journeys', type=int, default=100, help='Number of user journeys to run')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum number of concurrent journeys')
+    parser.add_argument('--rate', type=float, default=None, help='Journey arrival rate per second (default: unthrottled)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    advisor = None
+    if args.url:
+        client_factory = lambda: HTTPClient(args.url)
+    else:
+        from app import app, advisor
+        client_factory = lambda: InProcessClient(app)
+
+    generator = LoadGenerator(client_factory, seed=args.seed)
+    print_report(generator.run(args.journeys, args.concurrency, args.rate))
+
+    if advisor is not None:
+        print(f"\nSpeculative study plans: {advisor.plan_planner.stats()}")
+        print(f"BERT admission: {advisor.bert_admission.stats()}")
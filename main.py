@@ -1,88 +1,294 @@
 import argparse
+import json
+import sys
 import logging
-from career_advisor import CareerAdvisorAI
-from data_processor import DataProcessor
+from contextlib import nullcontext
+
+# career_advisor, data_processor and memory_report are imported by the commands that
+# use them, so that --help, prepare-data, score and cohort start without loading torch
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def main():
-    """Main entry point for the Career Advisor AI application"""
-    parser = argparse.ArgumentParser(description='Career Advisor AI')
-    parser.add_argument('--prepare-data', action='store_true', help='Prepare datasets before running the advisor')
-    parser.add_argument('--assessment-only', action='store_true', help='Run automated assessment without chat interface')
-    args = parser.parse_args()
+def prepare_data():
+    """Prepare the datasets and the catalog store"""
+    from data_processor import DataProcessor
+    logger.info("Preparing datasets...")
+    processor = DataProcessor()
+    datasets = processor.prepare_all_datasets()
+    logger.info("Datasets prepared successfully")
+    return datasets
+
+def create_advisor(args, load_model=True):
+    """Create the advisor with the model options of the command line"""
+    from career_advisor import CareerAdvisorAI
+    return CareerAdvisorAI(use_torchscript=getattr(args, 'torchscript', False),
+                           subject_dimensions=getattr(args, 'subject_dimensions', None),
+                           snapshot_path=getattr(args, 'snapshot', None),
+                           load_model=load_model)
+
+def print_memory_report(advisor, startup_memory):
+    """Run a synthetic request mix and report memory per component and peak RSS"""
+    from memory_report import PeakRSSTracker, format_bytes, peak_rss, synthetic_request_mix
+    with PeakRSSTracker() as request_memory:
+        synthetic_request_mix(advisor)
     
-    logger.info("Starting Career Advisor AI application...")
+    print("\n--- Memory by Component ---")
+    report = advisor.memory_report()
+    for component, size in sorted(report.items(), key=lambda item: item[1], reverse=True):
+        print(f"{component}: {format_bytes(size)}")
+    print(f"Total accounted: {format_bytes(sum(report.values()))}")
+    
+    if advisor.dataset_load_report:
+        print("\n--- Catalog Datasets ---")
+        for name, stats in advisor.dataset_load_report.items():
+            print(f"{name}: {stats['rows']} rows in {stats['seconds'] * 1000:.2f} ms, "
+                  f"{format_bytes(stats['file_bytes'])} on disk, {format_bytes(stats['frame_bytes'])} in memory")
+    
+    print("\n--- Resident Set Size ---")
+    for phase, tracker in (('Startup', startup_memory), ('Request mix', request_memory)):
+        summary = tracker.summary()
+        print(f"{phase}: start {format_bytes(summary['start_rss'])}, end {format_bytes(summary['end_rss'])}, "
+              f"peak {format_bytes(summary['peak_rss'])}")
+    print(f"Process peak: {format_bytes(peak_rss())}")
+
+def compile_bert(advisor):
+    """Compile the BERT encoder to TorchScript and switch to it"""
+    logger.info("Compiling BERT encoder to TorchScript...")
+    diffs = advisor.compile_bert_engine()
+    for bucket, diff in diffs.items():
+        logger.info(f"Bucket {bucket}: max difference from eager mode {diff:.2e}")
+
+def print_subject_index_report(advisor, n_components):
+    """Report memory, speed and accuracy of the reduced subject index"""
+    report = advisor.subject_index_report(n_components=n_components)
+    print("\n--- Subject Index Report ---")
+    print(f"Subjects: {report['subjects']}")
+    print(f"Dimensions: {report['full_dimensions']} -> {report['reduced_dimensions']}")
+    print(f"Memory: {report['full_bytes']} -> {report['reduced_bytes']} bytes "
+          f"({report['memory_saved_bytes']} saved)")
+    print(f"Search time: {report['full_search_seconds']*1e6:.1f} -> {report['reduced_search_seconds']*1e6:.1f} us "
+          f"({report['speedup']:.2f}x)")
+    print(f"Top-1 agreement: {report['top1_agreement']*100:.1f}%")
+
+def print_recommendations(trait_scores, career_recommendations, university_recommendations):
+    """Display personality traits, career and university recommendations"""
+    print("\n--- Your Personality Traits ---")
+    for trait, score in trait_scores.items():
+        print(f"{trait.capitalize()}: {score:.2f}/5.00")
+    
+    print("\n--- Recommended Careers ---")
+    for i, career in enumerate(career_recommendations, 1):
+        print(f"{i}. {career['occupation']} (Match: {career['score']:.2f})")
+        print(f"   Description: {career['description']}")
+        print(f"   Education Required: {career['education_required']}")
+        print()
+    
+    print("\n--- Recommended Universities ---")
+    for i, university in enumerate(university_recommendations, 1):
+        print(f"{i}. {university['university']} (Match: {university['score']:.2f})")
+        print(f"   Location: {university['location']}")
+        print(f"   Programs: {university['programs']}")
+        print(f"   Annual Cost: ${university['cost']}")
+        print(f"   Acceptance Rate: {university['acceptance_rate']*100:.1f}%")
+        print(f"   Graduation Rate: {university['graduation_rate']*100:.1f}%")
+        print()
+
+def print_study_plan(study_plan):
+    """Display a study plan"""
+    print("\n--- Study Plan for Top Career ---")
+    print(f"Major: {study_plan['major']}")
+    print(f"Matched Subject: {study_plan['matched_subject']}")
+    
+    print("\nRecommended Resources:")
+    print("Books:")
+    for book in study_plan['resources']['books']:
+        print(f"- {book}")
+    
+    print("\nCourses:")
+    for course in study_plan['resources']['courses']:
+        print(f"- {course}")
+    
+    print("\nVideos:")
+    print(f"- {study_plan['resources']['videos']}")
+    
+    print("\nStudy Timeline:")
+    for year, details in study_plan['study_timeline'].items():
+        print(f"\n{year.replace('_', ' ').title()}:")
+        print(f"Focus: {details['focus']}")
+        print("Courses:")
+        for course in details['courses']:
+            print(f"- {course}")
+        print("Projects:")
+        for project in details['projects']:
+            print(f"- {project}")
+
+def run_assessment(advisor):
+    """Run the automated assessment and display the results"""
+    logger.info("Running automated assessment...")
+    trait_scores, career_recommendations, university_recommendations, study_plan = advisor.run_assessment()
+    print_recommendations(trait_scores, career_recommendations, university_recommendations)
+    print_study_plan(study_plan)
+
+def run_chat(advisor):
+    """Run the interactive chat interface"""
+    logger.info("Starting interactive chat interface...")
+    advisor.chat_interface()
+
+def score_answers(args):
+    """Score a saved set of answers and recommend careers and universities without loading BERT"""
+    with (sys.stdin if args.answers == '-' else open(args.answers)) as f:
+        answers = json.load(f)
+    if 'personality_answers' in answers or 'interest_answers' in answers:
+        personality_answers = answers.get('personality_answers', {})
+        interest_answers = answers.get('interest_answers', {})
+    else:
+        personality_answers = interest_answers = answers
+    
+    advisor = create_advisor(args, load_model=False)
+    trait_scores = advisor.assess_personality(personality_answers)
+    interest_scores = advisor.assess_interests(interest_answers)
+    career_recommendations = advisor.recommend_careers(trait_scores, interest_scores, top_n=args.top_n)
+    university_recommendations = advisor.recommend_universities(career_recommendations, top_n=args.top_n)
+    
+    if args.json:
+        print(json.dumps({
+            'trait_scores': trait_scores,
+            'interest_scores': interest_scores,
+            'career_recommendations': career_recommendations,
+            'university_recommendations': university_recommendations
+        }, indent=2))
+    else:
+        print_recommendations(trait_scores, career_recommendations, university_recommendations)
+
+def run_legacy(args):
+    """Run the flag-based command line used before subcommands existed"""
+    from memory_report import PeakRSSTracker
     
     if args.prepare_data:
-        logger.info("Preparing datasets...")
-        processor = DataProcessor()
-        datasets = processor.prepare_all_datasets()
-        logger.info("Datasets prepared successfully")
+        prepare_data()
+    
+    with PeakRSSTracker() if args.memory_report else nullcontext() as startup_memory:
+        advisor = create_advisor(args)
+    
+    if args.save_snapshot:
+        advisor.save_snapshot(args.save_snapshot)
     
-    advisor = CareerAdvisorAI()
+    if args.memory_report:
+        print_memory_report(advisor, startup_memory)
+        return
+    
+    if args.compile_bert:
+        compile_bert(advisor)
+    
+    if args.subject_index_report:
+        print_subject_index_report(advisor, args.subject_dimensions or 128)
     
     if args.assessment_only:
-        logger.info("Running automated assessment...")
-        trait_scores, career_recommendations, university_recommendations, study_plan = advisor.run_assessment()
-        
-        # Display results
-        print("\n--- Your Personality Traits ---")
-        for trait, score in trait_scores.items():
-            print(f"{trait.capitalize()}: {score:.2f}/5.00")
-        
-        print("\n--- Recommended Careers ---")
-        for i, career in enumerate(career_recommendations, 1):
-            print(f"{i}. {career['occupation']} (Match: {career['score']:.2f})")
-            print(f"   Description: {career['description']}")
-            print(f"   Education Required: {career['education_required']}")
-            print()
-        
-        print("\n--- Recommended Universities ---")
-        for i, university in enumerate(university_recommendations, 1):
-            print(f"{i}. {university['university']} (Match: {university['score']:.2f})")
-            print(f"   Location: {university['location']}")
-            print(f"   Programs: {university['programs']}")
-            print(f"   Annual Cost: ${university['cost']}")
-            print(f"   Acceptance Rate: {university['acceptance_rate']*100:.1f}%")
-            print(f"   Graduation Rate: {university['graduation_rate']*100:.1f}%")
-            print()
-        
-        print("\n--- Study Plan for Top Career ---")
-        print(f"Major: {study_plan['major']}")
-        print(f"Matched Subject: {study_plan['matched_subject']}")
-        
-        print("\nRecommended Resources:")
-        print("Books:")
-        for book in study_plan['resources']['books']:
-            print(f"- {book}")
-        
-        print("\nCourses:")
-        for course in study_plan['resources']['courses']:
-            print(f"- {course}")
-        
-        print("\nVideos:")
-        print(f"- {study_plan['resources']['videos']}")
-        
-        print("\nStudy Timeline:")
-        for year, details in study_plan['study_timeline'].items():
-            print(f"\n{year.replace('_', ' ').title()}:")
-            print(f"Focus: {details['focus']}")
-            print("Courses:")
-            for course in details['courses']:
-                print(f"- {course}")
-            print("Projects:")
-            for project in details['projects']:
-                print(f"- {project}")
+        run_assessment(advisor)
+    else:
+        run_chat(advisor)
+
+def run_command(args):
+    """Run a subcommand"""
+    if args.command == 'prepare-data':
+        prepare_data()
+    elif args.command == 'score':
+        score_answers(args)
+    elif args.command == 'cohort':
+        import cohort_analytics
+        cohort_analytics.main(args.cohort_args)
+    elif args.command == 'memory-report':
+        from memory_report import PeakRSSTracker
+        with PeakRSSTracker() as startup_memory:
+            advisor = create_advisor(args)
+        print_memory_report(advisor, startup_memory)
+    else:
+        advisor = create_advisor(args)
+        if args.command == 'chat':
+            run_chat(advisor)
+        elif args.command == 'assess':
+            run_assessment(advisor)
+        elif args.command == 'compile-bert':
+            compile_bert(advisor)
+        elif args.command == 'save-snapshot':
+            advisor.save_snapshot(args.path)
+        elif args.command == 'subject-index-report':
+            print_subject_index_report(advisor, args.subject_dimensions or 128)
+
+# Flags of the legacy flow that have a subcommand of their own
+LEGACY_ONLY_FLAGS = ('prepare_data', 'assessment_only', 'compile_bert', 'subject_index_report',
+                     'save_snapshot', 'memory_report')
+
+def build_parser():
+    """Build the command-line parser with subcommands and the legacy flags"""
+    parser = argparse.ArgumentParser(description='Career Advisor AI',
+                                     epilog='Without a command, the flags below run the advisor as before.')
+    parser.add_argument('--prepare-data', action='store_true', help='Prepare datasets before running the advisor')
+    parser.add_argument('--assessment-only', action='store_true', help='Run automated assessment without chat interface')
+    parser.add_argument('--torchscript', action='store_true', help='Use the compiled TorchScript BERT encoder if available')
+    parser.add_argument('--compile-bert', action='store_true', help='Compile the BERT encoder to TorchScript and use it')
+    parser.add_argument('--subject-dimensions', type=int, default=None, help='PCA dimensions for the float16 subject index')
+    parser.add_argument('--subject-index-report', action='store_true', help='Report memory, speed and accuracy of the reduced subject index')
+    parser.add_argument('--snapshot', default=None, help='Start from a warm-start snapshot instead of loading from scratch')
+    parser.add_argument('--save-snapshot', default=None, help='Write a warm-start snapshot of the initialized advisor')
+    parser.add_argument('--memory-report', action='store_true', help='Report memory per component and peak RSS, then exit')
+    
+    # Options shared by the commands that load the BERT model; suppressed defaults keep
+    # the same options given before the command from being reset by the subparser
+    model_options = argparse.ArgumentParser(add_help=False)
+    model_options.add_argument('--torchscript', action='store_true', default=argparse.SUPPRESS,
+                               help='Use the compiled TorchScript BERT encoder if available')
+    model_options.add_argument('--subject-dimensions', type=int, default=argparse.SUPPRESS,
+                               help='PCA dimensions for the float16 subject index')
+    model_options.add_argument('--snapshot', default=argparse.SUPPRESS,
+                               help='Start from a warm-start snapshot instead of loading from scratch')
+    
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.add_parser('prepare-data', help='Prepare the datasets and the catalog store (no BERT)')
+    subparsers.add_parser('chat', parents=[model_options], help='Run the interactive chat interface')
+    subparsers.add_parser('assess', parents=[model_options], help='Run the automated assessment')
+    
+    score = subparsers.add_parser('score', help='Score saved answers and recommend careers and universities (no BERT)')
+    score.add_argument('answers', help='JSON file with personality_answers and interest_answers, or - for stdin')
+    score.add_argument('--top-n', type=int, default=3, help='Number of careers and universities to recommend')
+    score.add_argument('--json', action='store_true', help='Print the results as JSON')
+    
+    cohort = subparsers.add_parser('cohort', add_help=False, help='Cluster students into cohorts (no BERT); see cohort --help')
+    cohort.add_argument('cohort_args', nargs=argparse.REMAINDER, help='Arguments of the cohort analysis')
+    cohort.set_defaults(cohort_args=[])
+    
+    subparsers.add_parser('compile-bert', parents=[model_options], help='Compile the BERT encoder to TorchScript')
+    snapshot = subparsers.add_parser('save-snapshot', parents=[model_options], help='Write a warm-start snapshot')
+    snapshot.add_argument('path', help='Path to write the snapshot to')
+    subparsers.add_parser('memory-report', parents=[model_options], help='Report memory per component and peak RSS')
+    subparsers.add_parser('subject-index-report', parents=[model_options],
+                          help='Report memory, speed and accuracy of the reduced subject index')
+    return parser
+
+def main():
+    """Main entry point for the Career Advisor AI application"""
+    parser = build_parser()
+    args, extra = parser.parse_known_args()
+    if args.command == 'cohort':
+        # Options of the cohort analysis (including --help) are passed through unparsed
+        args.cohort_args = extra + args.cohort_args
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command is not None:
+        legacy_flags = ['--' + flag.replace('_', '-') for flag in LEGACY_ONLY_FLAGS if getattr(args, flag)]
+        if legacy_flags:
+            parser.error(f"{', '.join(legacy_flags)} cannot be combined with the {args.command} command")
+
+    logger.info("Starting Career Advisor AI application...")
+    
+    if args.command is None:
+        run_legacy(args)
     else:
-        # Run the interactive chat interface
-        logger.info("Starting interactive chat interface...")
-        advisor.chat_interface()
+        run_command(args)
     
     logger.info("Career Advisor AI application completed")
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,172 @@
+import pandas as pd
+import numpy as np
+from scipy import sparse
+import os
+import random
+import resource
+import sys
+import threading
+from typing import Dict, Any, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Seconds between RSS samples while tracking a phase
+RSS_SAMPLE_INTERVAL = 0.01
+
+# Majors and goals in the students' own words, which only the BERT tier can match
+FREE_TEXT_MAJORS = [
+    "building apps for phones and the web",
+    "helping patients recover after injuries",
+    "designing bridges and tall buildings",
+    "understanding why stock markets move",
+    "writing stories and scripts for films",
+    "protecting wildlife and the oceans"
+]
+
+# Share of the simulated users who type a free-text major and goal
+FREE_TEXT_SHARE = 0.5
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    Estimate the memory used by an object and everything it references
+
+    Args:
+        obj: Object to measure
+        seen: Ids of objects already counted
+
+    Returns:
+        Estimated size in bytes
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    if sparse.issparse(obj):
+        return sum(deep_sizeof(getattr(obj, name), seen) for name in ('data', 'indices', 'indptr')
+                   if hasattr(obj, name))
+    if type(obj).__module__.startswith('torch'):
+        if hasattr(obj, 'element_size'):
+            return obj.numel() * obj.element_size()
+        return module_bytes(obj) if hasattr(obj, 'parameters') else 0
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__') and not callable(obj):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+def module_bytes(module: Any) -> int:
+    """Bytes used by the parameters and buffers of a torch module"""
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+def tokenizer_bytes(tokenizer: Any) -> int:
+    """Bytes used by a tokenizer's vocabulary tables"""
+    seen = set()
+    tables = [getattr(tokenizer, name) for name in ('vocab', 'ids_to_tokens') if hasattr(tokenizer, name)]
+    if not tables:
+        tables = [tokenizer.get_vocab()]
+    return sum(deep_sizeof(table, seen) for table in tables)
+
+
+def current_rss() -> int:
+    """Current resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return peak_rss()
+
+
+def peak_rss() -> int:
+    """Peak resident set size of this process so far in bytes"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count for display"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{int(size)} B"
+        size /= 1024
+
+
+class PeakRSSTracker:
+    """
+    Context manager sampling the RSS in a background thread to find the peak of a phase
+    """
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.start_rss = 0
+        self.end_rss = 0
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_rss = max(self.peak_rss, current_rss())
+
+    def __enter__(self) -> 'PeakRSSTracker':
+        self.start_rss = self.peak_rss = current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.end_rss = current_rss()
+        self.peak_rss = max(self.peak_rss, self.end_rss)
+
+    def summary(self) -> Dict[str, int]:
+        """Start, end and peak RSS of the phase in bytes"""
+        return {'start_rss': self.start_rss, 'end_rss': self.end_rss, 'peak_rss': self.peak_rss}
+
+
+def synthetic_request_mix(advisor: Any, requests: int = 50, seed: int = 0) -> None:
+    """
+    Run a mix of assessment, recommendation and study plan requests against the advisor
+
+    Part of the users type a free-text major and career goal, so the mix includes the
+    transformer passes of the subject matcher and the semantic career search.
+
+    Args:
+        advisor: CareerAdvisorAI instance
+        requests: Number of simulated users
+        seed: Random seed for the answers
+    """
+    rng = random.Random(seed)
+    majors = list(advisor.resources_data['subject']) + list(advisor.onet_data['occupation'])
+    for _ in range(requests):
+        personality_answers = {q['id']: rng.randint(1, 5) for q in advisor.personality_questions}
+        interest_answers = {q['id']: rng.randint(1, 5) for q in advisor.subject_interest_questions}
+        trait_scores = advisor.assess_personality(personality_answers)
+        interest_scores = advisor.assess_interests(interest_answers)
+        career_recommendations = advisor.recommend_careers(trait_scores, interest_scores)
+        advisor.recommend_universities(career_recommendations)
+        if rng.random() < FREE_TEXT_SHARE:
+            goal = rng.choice(FREE_TEXT_MAJORS)
+            advisor.recommend_careers_semantic([goal], profiles=[(trait_scores, interest_scores)])
+            advisor.generate_study_plan(goal)
+        else:
+            advisor.generate_study_plan(rng.choice(majors))
@@ -0,0 +1,255 @@
+import numpy as np
+from scipy import sparse
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Likert scale used by the questionnaires
+LIKERT_SCALE = (1, 5)
+
+# Personality assessment questions, one item per trait
+PERSONALITY_QUESTIONS = [
+    {
+        "id": "analytical",
+        "question": "Do you enjoy solving complex problems and puzzles?",
+        "trait": "analytical"
+    },
+    {
+        "id": "creative",
+        "question": "Do you often come up with unique ideas or solutions?",
+        "trait": "creative"
+    },
+    {
+        "id": "detail_oriented",
+        "question": "Do you pay close attention to details and notice small errors?",
+        "trait": "detail-oriented"
+    },
+    {
+        "id": "patient",
+        "question": "Are you patient when dealing with challenging situations?",
+        "trait": "patient"
+    },
+    {
+        "id": "communicative",
+        "question": "Do you enjoy explaining concepts to others?",
+        "trait": "communicative"
+    },
+    {
+        "id": "organized",
+        "question": "Do you prefer to have a structured plan for your activities?",
+        "trait": "organized"
+    },
+    {
+        "id": "persuasive",
+        "question": "Are you good at convincing others of your point of view?",
+        "trait": "persuasive"
+    },
+    {
+        "id": "curious",
+        "question": "Do you often seek to learn new things out of curiosity?",
+        "trait": "curious"
+    },
+    {
+        "id": "technical",
+        "question": "Do you enjoy working with technology and learning how things work?",
+        "trait": "technical"
+    },
+    {
+        "id": "compassionate",
+        "question": "Do you feel strongly about helping others in need?",
+        "trait": "compassionate"
+    }
+]
+
+# Subject interest assessment questions, one item per subject
+SUBJECT_INTEREST_QUESTIONS = [
+    {
+        "id": "programming",
+        "question": "How much do you enjoy programming or coding?",
+        "subject": "programming"
+    },
+    {
+        "id": "mathematics",
+        "question": "How interested are you in mathematics and statistical analysis?",
+        "subject": "mathematics"
+    },
+    {
+        "id": "biology",
+        "question": "How interested are you in biology and life sciences?",
+        "subject": "biology"
+    },
+    {
+        "id": "chemistry",
+        "question": "How interested are you in chemistry and chemical processes?",
+        "subject": "chemistry"
+    },
+    {
+        "id": "education",
+        "question": "How much do you enjoy teaching or explaining concepts to others?",
+        "subject": "education"
+    },
+    {
+        "id": "business",
+        "question": "How interested are you in business and entrepreneurship?",
+        "subject": "business"
+    },
+    {
+        "id": "writing",
+        "question": "How much do you enjoy writing and communication?",
+        "subject": "writing"
+    },
+    {
+        "id": "technology",
+        "question": "How interested are you in technology and its applications?",
+        "subject": "technology"
+    },
+    {
+        "id": "helping_others",
+        "question": "How important is it for you to directly help others in your career?",
+        "subject": "helping others"
+    },
+    {
+        "id": "research",
+        "question": "How much do you enjoy conducting research and investigation?",
+        "subject": "research"
+    }
+]
+
+
+class QuestionBank:
+    """
+    Question bank compiled into a sparse item x scale loading matrix, so that scoring
+    one student or a whole batch is a single sparse product plus normalization
+
+    Each question loads on the scale named by its key field. Optional fields:
+    "keyed" ("+" or "-", reverse-keyed items are scored as low + high - answer)
+    and "weight" (defaults to 1).
+    """
+
+    def __init__(self, questions: List[Dict[str, Any]], key: str, scale: Tuple[int, int] = LIKERT_SCALE):
+        """
+        Initialize the QuestionBank
+
+        Args:
+            questions: Question definitions with an "id" and the key field
+            key: Field naming the scale an item loads on (e.g. "trait" or "subject")
+            scale: Lowest and highest valid answer
+        """
+        self.key = key
+        self.low, self.high = scale
+        self.item_ids = [question['id'] for question in questions]
+        self.items = {qid: item for item, qid in enumerate(self.item_ids)}
+        self.scales = list(dict.fromkeys(question[key] for question in questions))
+        scale_columns = {name: column for column, name in enumerate(self.scales)}
+
+        rows, columns, loadings, offsets = [], [], [], []
+        for item, question in enumerate(questions):
+            weight = float(question.get('weight', 1.0))
+            reverse = question.get('keyed', '+') == '-'
+            rows.append(item)
+            columns.append(scale_columns[question[key]])
+            loadings.append(-weight if reverse else weight)
+            offsets.append((self.low + self.high) * weight if reverse else 0.0)
+
+        shape = (len(self.item_ids), len(self.scales))
+        self.loadings = sparse.csr_matrix((loadings, (rows, columns)), shape=shape)
+        self.weights = abs(self.loadings)
+
+        # [answers, mask] @ [loadings; offsets] gives the keyed, weighted answer sums
+        offset_matrix = sparse.csr_matrix((offsets, (rows, columns)), shape=shape)
+        self.scoring_matrix = sparse.vstack([self.loadings, offset_matrix]).tocsr()
+
+    @property
+    def size(self) -> int:
+        """Number of items in the bank"""
+        return len(self.item_ids)
+
+    def answer_matrix(self, answers: Iterable[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Arrange answer dictionaries into an answer matrix and a mask of answered items
+
+        Answers to unknown questions are ignored; missing, non-numeric and out-of-scale
+        answers are masked out.
+
+        Args:
+            answers: One dictionary per student mapping question IDs to answers
+
+        Returns:
+            Tuple of the answer matrix and the answered mask (students x items)
+        """
+        answers = list(answers)
+        values = np.full((len(answers), self.size), np.nan)
+        for row, student in enumerate(answers):
+            for qid, answer in student.items():
+                item = self.items.get(qid)
+                if item is not None:
+                    try:
+                        values[row, item] = float(answer)
+                    except (TypeError, ValueError):
+                        pass
+        return self.mask(values)
+
+    def mask(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Mask missing (NaN) and out-of-scale entries of an answer matrix
+
+        Args:
+            values: Answer matrix (students x items)
+
+        Returns:
+            Tuple of the answer matrix with masked entries zeroed and the answered mask
+        """
+        values = np.asarray(values, dtype=float)
+        with np.errstate(invalid='ignore'):
+            answered = (values >= self.low) & (values <= self.high)
+        return np.where(answered, values, 0.0), answered.astype(float)
+
+    def score_matrix(self, values: np.ndarray, answered: np.ndarray) -> np.ndarray:
+        """
+        Score a batch of students
+
+        Args:
+            values: Answer matrix with unanswered entries zeroed (students x items)
+            answered: Mask of answered items (students x items)
+
+        Returns:
+            Weighted mean of the keyed answers per scale (students x scales), NaN for
+            scales without any answered item
+        """
+        totals = np.asarray(np.hstack([values, answered]) @ self.scoring_matrix)
+        counts = np.asarray(answered @ self.weights)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, totals / counts, np.nan)
+
+    def score_batch(self, answers: Iterable[Dict[str, Any]]) -> np.ndarray:
+        """
+        Score the answer dictionaries of a batch of students
+
+        Args:
+            answers: One dictionary per student mapping question IDs to answers
+
+        Returns:
+            Score matrix (students x scales), columns in the order of self.scales
+        """
+        return self.score_matrix(*self.answer_matrix(answers))
+
+    def score(self, answers: Dict[str, Any]) -> Dict[str, float]:
+        """
+        Score the answers of one student
+
+        Args:
+            answers: Dictionary mapping question IDs to answers
+
+        Returns:
+            Dictionary mapping each scale with at least one answered item to its score
+        """
+        scores = self.score_batch([answers])[0]
+        return {name: float(score) for name, score in zip(self.scales, scores) if not np.isnan(score)}
+
+    def to_dicts(self, scores: np.ndarray) -> List[Dict[str, float]]:
+        """Convert the rows of a score matrix to score dictionaries"""
+        return [{name: float(score) for name, score in zip(self.scales, row) if not np.isnan(score)}
+                for row in scores]
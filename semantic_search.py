@@ -0,0 +1,130 @@
+import numpy as np
+import hashlib
+import os
+from typing import List, Dict, Any, Optional
+import logging
+from weight_sweep import top_rows
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Directory holding the persisted occupation embedding matrices
+SEMANTIC_CACHE_DIR = os.path.join("models", "semantic")
+
+# Default share of the trait and interest match when blending with semantic similarity
+DEFAULT_PROFILE_WEIGHT = 0.3
+
+
+def occupation_text(occupation: str, description: str) -> str:
+    """Text embedded for an occupation: its title followed by its description"""
+    return f"{occupation}. {description}"
+
+
+class SemanticCareerIndex:
+    """
+    Normalized occupation embeddings ranked against free-text goals with one matrix
+    product, optionally blended with the trait and interest match
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], embeddings: np.ndarray):
+        """
+        Initialize the SemanticCareerIndex
+
+        Args:
+            records: Occupation records, one per embedding row
+            embeddings: Occupation embeddings (n_occupations x dim), normalized here if needed
+        """
+        self.records = records
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        if not np.allclose(norms, 1, atol=1e-5):
+            embeddings = embeddings / np.where(norms == 0, 1, norms)
+        self.vectors = embeddings
+
+    @staticmethod
+    def cache_path(cache_dir: str, version: str) -> str:
+        """Path of the persisted matrix for a model and dataset version"""
+        digest = hashlib.sha256(version.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(cache_dir, f"occupations-{digest}.npy")
+
+    def save(self, path: str) -> None:
+        """Persist the normalized embedding matrix"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, self.vectors)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved occupation embeddings to {path}")
+
+    @classmethod
+    def load(cls, records: List[Dict[str, Any]], path: str) -> Optional['SemanticCareerIndex']:
+        """
+        Memory-map a persisted embedding matrix
+
+        Args:
+            records: Occupation records the matrix was built from
+            path: Path of the persisted matrix
+
+        Returns:
+            The index, or None if the file is missing or does not match the records
+        """
+        if not os.path.exists(path):
+            return None
+        vectors = np.load(path, mmap_mode='r')
+        if vectors.ndim != 2 or vectors.shape[0] != len(records):
+            logger.warning(f"Ignoring occupation embeddings at {path}: shape {vectors.shape} "
+                           f"does not match {len(records)} occupations")
+            return None
+        logger.info(f"Loaded occupation embeddings from {path}")
+        return cls(records, vectors)
+
+    @property
+    def size(self) -> int:
+        """Number of indexed occupations"""
+        return len(self.records)
+
+    def similarities(self, query_embeddings: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of every occupation with every query
+
+        Args:
+            query_embeddings: Query embeddings (n_queries x dim)
+
+        Returns:
+            Similarity matrix (n_occupations x n_queries)
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.vectors.shape[1])
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        return self.vectors @ (queries / np.where(norms == 0, 1, norms)).T
+
+    def search(self, query_embeddings: np.ndarray, top_n: int = 3, profile_scores: Optional[np.ndarray] = None,
+               profile_weight: float = 0.0) -> List[List[Dict[str, Any]]]:
+        """
+        Rank occupations for a batch of queries
+
+        Args:
+            query_embeddings: Query embeddings (n_queries x dim)
+            top_n: Number of occupations to return per query
+            profile_scores: Optional trait and interest match in [0, 1] (n_occupations x n_queries)
+            profile_weight: Share of the profile score in the blended score
+
+        Returns:
+            For each query, the top occupations with their blended score, similarity and profile score
+        """
+        similarities = self.similarities(query_embeddings)
+        scores = similarities
+        if profile_scores is not None and profile_weight:
+            scores = (1 - profile_weight) * similarities + profile_weight * profile_scores
+
+        results = []
+        for column, rows in enumerate(top_rows(scores, top_n)):
+            ranked = []
+            for row in rows:
+                result = dict(self.records[row], score=float(scores[row, column]),
+                              similarity=float(similarities[row, column]))
+                if profile_scores is not None:
+                    result['profile_score'] = float(profile_scores[row, column])
+                ranked.append(result)
+            results.append(ranked)
+        return results
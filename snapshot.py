@@ -0,0 +1,278 @@
+import torch
+import pandas as pd
+import numpy as np
+from transformers import BertConfig, BertModel, BertTokenizer
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+import time
+from typing import List, Dict, Any, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'EDUSNAP\0'
+SNAPSHOT_FORMAT_VERSION = 2
+
+# Sections start on this boundary so arrays can be mapped in place
+SECTION_ALIGNMENT = 64
+
+# Preamble: magic, header length, header SHA-256
+PREAMBLE = struct.Struct('<8sQ32s')
+
+DATASETS = ('onet_data', 'college_data', 'resources_data')
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot is missing, corrupt or from an incompatible version"""
+
+
+def _align(offset: int) -> int:
+    return (offset + SECTION_ALIGNMENT - 1) // SECTION_ALIGNMENT * SECTION_ALIGNMENT
+
+
+class SnapshotWriter:
+    """Collects named binary sections and writes them to a single snapshot file"""
+
+    def __init__(self):
+        self.sections: List[Tuple[Dict[str, Any], bytes]] = []
+
+    def add_bytes(self, name: str, data: bytes, kind: str = 'bytes', **meta: Any) -> None:
+        self.sections.append((dict(name=name, kind=kind, **meta), data))
+
+    def add_json(self, name: str, value: Any) -> None:
+        self.add_bytes(name, json.dumps(value).encode('utf-8'), kind='json')
+
+    def add_array(self, name: str, array: np.ndarray) -> None:
+        array = np.ascontiguousarray(array)
+        self.add_bytes(name, array.tobytes(), kind='array', dtype=array.dtype.str, shape=list(array.shape))
+
+    def add_frame(self, name: str, data: pd.DataFrame) -> None:
+        """Store a DataFrame column by column: numeric columns raw, strings as offsets plus UTF-8 data"""
+        for column in data.columns:
+            values = data[column]
+            if not (pd.api.types.is_numeric_dtype(values) or pd.api.types.is_bool_dtype(values)):
+                encoded = [str(value).encode('utf-8') for value in values]
+                offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+                offsets[1:] = np.cumsum([len(value) for value in encoded])
+                self.add_array(f"{name}/{column}/offsets", offsets)
+                self.add_bytes(f"{name}/{column}/data", b''.join(encoded), kind='strings', frame=name, column=column)
+            else:
+                self.add_array(f"{name}/{column}", values.to_numpy())
+        self.add_json(f"{name}/columns", list(data.columns))
+
+    def write(self, path: str, header: Dict[str, Any]) -> None:
+        """Write the header and every section to the given path"""
+        entries = []
+        offset = 0
+        for meta, data in self.sections:
+            offset = _align(offset)
+            entries.append(dict(meta, offset=offset, length=len(data), sha256=hashlib.sha256(data).hexdigest()))
+            offset += len(data)
+
+        header = dict(header, format_version=SNAPSHOT_FORMAT_VERSION, sections=entries)
+        header_bytes = json.dumps(header).encode('utf-8')
+        data_start = _align(PREAMBLE.size + len(header_bytes))
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(PREAMBLE.pack(SNAPSHOT_MAGIC, len(header_bytes), hashlib.sha256(header_bytes).digest()))
+            f.write(header_bytes)
+            for entry, (_, data) in zip(entries, self.sections):
+                f.seek(data_start + entry['offset'])
+                f.write(data)
+        os.replace(tmp_path, path)
+
+
+class SnapshotReader:
+    """Memory-maps a snapshot file and gives access to its sections"""
+
+    def __init__(self, path: str, verify: bool = True):
+        """
+        Open a snapshot file
+
+        Args:
+            path: Path of the snapshot
+            verify: Check the SHA-256 of every section
+
+        Raises:
+            SnapshotError: If the file is missing, corrupt or has an unsupported version
+        """
+        if not os.path.exists(path):
+            raise SnapshotError(f"Snapshot not found: {path}")
+
+        with open(path, 'rb') as f:
+            # Copy-on-write mapping so arrays can back writable tensors without touching the file
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        magic, header_length, header_digest = PREAMBLE.unpack_from(self.buffer, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"Not a Career Advisor snapshot: {path}")
+        header_bytes = self.buffer[PREAMBLE.size:PREAMBLE.size + header_length]
+        if hashlib.sha256(header_bytes).digest() != header_digest:
+            raise SnapshotError(f"Snapshot header checksum mismatch: {path}")
+
+        self.header = json.loads(header_bytes)
+        if self.header.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"Unsupported snapshot version {self.header.get('format_version')}")
+
+        self.data_start = _align(PREAMBLE.size + header_length)
+        self.sections = {entry['name']: entry for entry in self.header['sections']}
+        if verify:
+            self.verify()
+
+    def _view(self, entry: Dict[str, Any]) -> memoryview:
+        start = self.data_start + entry['offset']
+        return memoryview(self.buffer)[start:start + entry['length']]
+
+    def verify(self) -> None:
+        """Check every section against its recorded SHA-256"""
+        for name, entry in self.sections.items():
+            if hashlib.sha256(self._view(entry)).hexdigest() != entry['sha256']:
+                raise SnapshotError(f"Snapshot section {name} failed checksum verification")
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sections
+
+    def bytes(self, name: str) -> bytes:
+        return self._view(self.sections[name]).tobytes()
+
+    def json(self, name: str) -> Any:
+        return json.loads(self.bytes(name))
+
+    def array(self, name: str) -> np.ndarray:
+        """Array backed directly by the mapped file"""
+        entry = self.sections[name]
+        array = np.frombuffer(self.buffer, dtype=np.dtype(entry['dtype']),
+                              count=int(np.prod(entry['shape'], dtype=np.int64)),
+                              offset=self.data_start + entry['offset'])
+        return array.reshape(entry['shape'])
+
+    def frame(self, name: str) -> pd.DataFrame:
+        columns = {}
+        for column in self.json(f"{name}/columns"):
+            if f"{name}/{column}/offsets" in self:
+                offsets = self.array(f"{name}/{column}/offsets")
+                data = self.bytes(f"{name}/{column}/data")
+                columns[column] = [data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+            else:
+                columns[column] = self.array(f"{name}/{column}")
+        return pd.DataFrame(columns)
+
+
+def _set_tensor(model: torch.nn.Module, name: str, tensor: torch.Tensor, is_parameter: bool) -> None:
+    module_name, _, attribute = name.rpartition('.')
+    module = model.get_submodule(module_name) if module_name else model
+    if is_parameter:
+        module._parameters[attribute] = torch.nn.Parameter(tensor, requires_grad=False)
+    else:
+        module._buffers[attribute] = tensor
+
+
+def save_snapshot(advisor: Any, path: str) -> Dict[str, Any]:
+    """
+    Serialize the ready-to-serve state of an advisor to a single file
+
+    Args:
+        advisor: Initialized CareerAdvisorAI
+        path: Path to write the snapshot to
+
+    Returns:
+        The snapshot header
+    """
+    logger.info(f"Writing snapshot to {path}...")
+    writer = SnapshotWriter()
+
+    # Model weights, including non-persistent buffers, as raw arrays
+    writer.add_json('model/config', advisor.model.config.to_dict())
+    for name, parameter in advisor.model.named_parameters():
+        writer.add_array(f"model/parameters/{name}", parameter.detach().cpu().numpy())
+    for name, buffer in advisor.model.named_buffers():
+        writer.add_array(f"model/buffers/{name}", buffer.detach().cpu().numpy())
+
+    with tempfile.TemporaryDirectory() as tokenizer_dir:
+        advisor.tokenizer.save_pretrained(tokenizer_dir)
+        tokenizer_files = sorted(os.listdir(tokenizer_dir))
+        for file_name in tokenizer_files:
+            with open(os.path.join(tokenizer_dir, file_name), 'rb') as f:
+                writer.add_bytes(f"tokenizer/{file_name}", f.read())
+    writer.add_json('tokenizer/files', tokenizer_files)
+
+    for name in DATASETS:
+        writer.add_frame(f"datasets/{name}", getattr(advisor, name))
+
+    # Compiled indexes are pickled together so shared references survive
+    indexes = {name: getattr(advisor, name) for name in ('career_engine', 'university_index', 'weight_sweeper')}
+    indexes['subject_matcher'] = advisor.get_subject_matcher()
+    writer.add_bytes('indexes', pickle.dumps(indexes, protocol=pickle.HIGHEST_PROTOCOL), kind='pickle')
+
+    writer.add_array('embeddings/subjects', advisor.get_subject_embeddings())
+    writer.add_json('questions', {'personality': advisor.personality_questions,
+                                  'subject_interest': advisor.subject_interest_questions})
+
+    header = {
+        'created_at': time.time(),
+        'model_revision': advisor.model_revision,
+        'dataset_version': advisor.dataset_version,
+        'datasets_loaded_at': advisor.datasets_loaded_at
+    }
+    writer.write(path, header)
+    logger.info(f"Snapshot written ({os.path.getsize(path)} bytes)")
+    return header
+
+
+def restore_snapshot(advisor: Any, path: str, device: torch.device, verify: bool = True) -> None:
+    """
+    Restore the model, datasets, indexes, embeddings and questions of an advisor from a snapshot
+
+    The snapshot contains pickled indexes, so only restore files you created.
+
+    Args:
+        advisor: CareerAdvisorAI being initialized
+        path: Path of the snapshot
+        device: Device to place the model on
+        verify: Check the SHA-256 of every section
+    """
+    start = time.perf_counter()
+    reader = SnapshotReader(path, verify=verify)
+
+    # Build the model skeleton without initializing weights, then point it at the mapped arrays
+    config = BertConfig.from_dict(reader.json('model/config'))
+    config._commit_hash = reader.header['model_revision']
+    with torch.device('meta'):
+        model = BertModel(config)
+    for name in reader.sections:
+        for prefix, is_parameter in (('model/parameters/', True), ('model/buffers/', False)):
+            if name.startswith(prefix):
+                _set_tensor(model, name[len(prefix):], torch.from_numpy(reader.array(name)), is_parameter)
+    advisor.model = model.to(device)
+    advisor.model.eval()
+
+    with tempfile.TemporaryDirectory() as tokenizer_dir:
+        for file_name in reader.json('tokenizer/files'):
+            with open(os.path.join(tokenizer_dir, file_name), 'wb') as f:
+                f.write(reader.bytes(f"tokenizer/{file_name}"))
+        advisor.tokenizer = BertTokenizer.from_pretrained(tokenizer_dir)
+
+    for name in DATASETS:
+        setattr(advisor, name, reader.frame(f"datasets/{name}"))
+    advisor.dataset_version = reader.header['dataset_version']
+    advisor.datasets_loaded_at = reader.header['datasets_loaded_at']
+
+    for name, index in pickle.loads(reader.bytes('indexes')).items():
+        setattr(advisor, name, index)
+    advisor.subject_embeddings = reader.array('embeddings/subjects')
+
+    questions = reader.json('questions')
+    advisor.personality_questions = questions['personality']
+    advisor.subject_interest_questions = questions['subject_interest']
+
+    # Keep the mapping alive for as long as the arrays backed by it
+    advisor.snapshot_reader = reader
+    logger.info(f"Restored snapshot {path} in {time.perf_counter() - start:.2f}s")
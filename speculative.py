@@ -0,0 +1,180 @@
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+class SpeculativePlanner:
+    """
+    Background worker pool that precomputes study plans for majors the user is
+    likely to ask for next, sharing the results through a bounded cache
+    """
+
+    def __init__(self, generate: Callable[[str], Dict[str, Any]], max_workers: int = 1,
+                 max_pending: int = 16, max_entries: int = 256):
+        """
+        Initialize the SpeculativePlanner
+
+        Args:
+            generate: Function generating the study plan for a major
+            max_workers: Number of background worker threads
+            max_pending: Maximum number of speculative plans queued or running at once
+            max_entries: Maximum number of plans kept in the cache
+        """
+        self.generate = generate
+        self.max_pending = max_pending
+        self.max_entries = max_entries
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='speculative-plan')
+        self.plans: 'OrderedDict[str, Future]' = OrderedDict()
+        self.speculative = set()
+        # Ticket of each speculative plan and the number of callers still waiting for it
+        self.tickets: Dict[str, int] = {}
+        self.claims = Counter()
+        self._next_ticket = 0
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def _pending(self) -> int:
+        return sum(1 for major in self.speculative if not self.plans[major].done())
+
+    def _release(self, major: str) -> None:
+        self.speculative.discard(major)
+        self.tickets.pop(major, None)
+        self.claims.pop(major, None)
+
+    def _evict(self) -> None:
+        while len(self.plans) > self.max_entries:
+            major, future = self.plans.popitem(last=False)
+            if major in self.speculative:
+                self._release(major)
+                future.cancel()
+                self.counters['wasted'] += 1
+
+    def submit(self, majors: Iterable[str]) -> List[Tuple[str, int]]:
+        """
+        Start generating study plans for the given majors in the background
+
+        A major whose speculative plan is already queued by another caller is joined
+        instead of queued again.
+
+        Args:
+            majors: Majors to precompute plans for
+
+        Returns:
+            Claims (major, ticket) on the queued or joined plans, to pass to cancel()
+        """
+        claimed = []
+        with self._lock:
+            for major in majors:
+                if major in self.plans:
+                    if major in self.speculative:
+                        self.claims[major] += 1
+                        claimed.append((major, self.tickets[major]))
+                    continue
+                if self._pending() >= self.max_pending:
+                    self.counters['skipped'] += 1
+                    continue
+                self.plans[major] = self.pool.submit(self.generate, major)
+                self.speculative.add(major)
+                self._next_ticket += 1
+                self.tickets[major] = self._next_ticket
+                self.claims[major] = 1
+                self.counters['submitted'] += 1
+                claimed.append((major, self._next_ticket))
+            self._evict()
+        return claimed
+
+    def cancel(self, claims: Optional[Iterable[Tuple[str, int]]] = None) -> int:
+        """
+        Release claims on speculative plans, cancelling the plans no caller waits for any more
+
+        Args:
+            claims: Claims returned by submit() (defaults to cancelling every pending plan)
+
+        Returns:
+            Number of plans cancelled
+        """
+        cancelled = 0
+        with self._lock:
+            if claims is None:
+                majors = list(self.speculative)
+            else:
+                majors = []
+                for major, ticket in claims:
+                    # Ignore claims on plans that were already read, evicted or queued again since
+                    if self.tickets.get(major) != ticket:
+                        continue
+                    self.claims[major] -= 1
+                    if self.claims[major] <= 0:
+                        majors.append(major)
+            for major in majors:
+                future = self.plans.get(major)
+                if future is not None and future.cancel():
+                    del self.plans[major]
+                    self._release(major)
+                    self.counters['cancelled'] += 1
+                    cancelled += 1
+        return cancelled
+
+    def get(self, major: str) -> Dict[str, Any]:
+        """
+        Get the study plan for a major, using a precomputed plan when one exists
+
+        Args:
+            major: The major to get a study plan for
+
+        Returns:
+            Dictionary containing study plan details
+        """
+        with self._lock:
+            self.counters['lookups'] += 1
+            future = self.plans.get(major)
+            if future is not None:
+                self.plans.move_to_end(major)
+                if major in self.speculative:
+                    self._release(major)
+                    self.counters['speculative_hits' if future.done() else 'in_flight_hits'] += 1
+                else:
+                    self.counters['cache_hits'] += 1
+
+        if future is not None and not future.cancelled():
+            try:
+                return future.result()
+            except Exception as e:
+                logger.warning(f"Precomputed study plan for {major} failed: {e}")
+
+        with self._lock:
+            self.counters['misses'] += 1
+        plan = self.generate(major)
+
+        done = Future()
+        done.set_result(plan)
+        with self._lock:
+            self.plans[major] = done
+            self._evict()
+        return plan
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get speculation counters and the speculative hit rate
+
+        Returns:
+            Dictionary with the counters, pending work and hit rate
+        """
+        with self._lock:
+            stats = dict(self.counters)
+            stats['pending'] = self._pending()
+            lookups = self.counters['lookups']
+            speculative = self.counters['speculative_hits'] + self.counters['in_flight_hits']
+            stats['speculative_hit_rate'] = speculative / lookups if lookups else 0.0
+        return stats
+
+    def shutdown(self) -> None:
+        """Cancel pending work and stop the worker threads"""
+        self.cancel()
+        self.pool.shutdown(wait=False)
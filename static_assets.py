@@ -0,0 +1,145 @@
+from flask import Flask, abort, request, send_file, url_for
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+from typing import Dict, List, Optional
+import logging
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always built
+    brotli = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# File types worth precompressing
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.html', '.json', '.txt', '.map'}
+
+# Cache lifetime for fingerprinted assets (one year)
+IMMUTABLE_MAX_AGE = 31536000
+
+
+class StaticAssetManifest:
+    """
+    Builds content-hashed copies of the static assets with precompressed gzip and
+    brotli variants, and serves them with far-future immutable cache headers
+    """
+
+    def __init__(self, static_folder: str, build_folder: str, url_prefix: str = '/assets'):
+        """
+        Initialize the StaticAssetManifest
+
+        Args:
+            static_folder: Directory with the source static files
+            build_folder: Directory to write the fingerprinted files to
+            url_prefix: URL prefix the fingerprinted files are served under
+        """
+        self.static_folder = static_folder
+        self.build_folder = build_folder
+        self.url_prefix = url_prefix
+        self.manifest: Dict[str, str] = {}
+        self.encodings: Dict[str, List[str]] = {}
+
+    @staticmethod
+    def hashed_name(filename: str, content: bytes) -> str:
+        """Insert a content hash before the file extension"""
+        root, ext = os.path.splitext(filename)
+        return f"{root}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+
+    def build(self) -> Dict[str, str]:
+        """
+        Fingerprint and precompress every static file
+
+        Returns:
+            Dictionary mapping source filenames to fingerprinted filenames
+        """
+        logger.info(f"Building static assets into {self.build_folder}...")
+        if os.path.exists(self.build_folder):
+            shutil.rmtree(self.build_folder)
+
+        manifest, encodings = {}, {}
+        for root, _, files in os.walk(self.static_folder):
+            for name in sorted(files):
+                source = os.path.join(root, name)
+                filename = os.path.relpath(source, self.static_folder).replace(os.sep, '/')
+                with open(source, 'rb') as f:
+                    content = f.read()
+
+                hashed = self.hashed_name(filename, content)
+                target = os.path.join(self.build_folder, hashed)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, 'wb') as f:
+                    f.write(content)
+
+                # Precompressed variants, most preferred first
+                encodings[hashed] = []
+                if os.path.splitext(name)[1] in COMPRESSIBLE_EXTENSIONS:
+                    if brotli is not None:
+                        with open(target + '.br', 'wb') as f:
+                            f.write(brotli.compress(content, quality=11))
+                        encodings[hashed].append('br')
+                    with open(target + '.gz', 'wb') as f:
+                        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+                    encodings[hashed].append('gzip')
+
+                manifest[filename] = hashed
+
+        with open(os.path.join(self.build_folder, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        self.manifest = manifest
+        self.encodings = encodings
+        logger.info(f"Built {len(manifest)} static assets (brotli {'enabled' if brotli else 'unavailable'})")
+        return manifest
+
+    def asset_url(self, filename: str) -> str:
+        """
+        URL of the fingerprinted version of a static file
+
+        Args:
+            filename: Path of the file relative to the static folder
+
+        Returns:
+            The fingerprinted URL, or the plain static URL for unknown files
+        """
+        hashed = self.manifest.get(filename)
+        if hashed is None:
+            return url_for('static', filename=filename)
+        return url_for('hashed_asset', filename=hashed)
+
+    def negotiate(self, filename: str) -> Optional[str]:
+        """Pick the best precompressed encoding of a built file accepted by the client"""
+        best, best_quality = None, 0
+        for encoding in self.encodings[filename]:
+            quality = request.accept_encodings[encoding]
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def serve(self, filename: str):
+        """Serve a fingerprinted asset, picking a precompressed variant if accepted"""
+        if filename not in self.encodings:
+            abort(404)
+
+        path = os.path.join(self.build_folder, filename)
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        encoding = self.negotiate(filename)
+        suffix = {'br': '.br', 'gzip': '.gz'}.get(encoding, '')
+
+        response = send_file(path + suffix, mimetype=mimetype, conditional=True, etag=True,
+                             max_age=IMMUTABLE_MAX_AGE)
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.cache_control.immutable = True
+        return response
+
+    def init_app(self, app: Flask) -> None:
+        """Register the asset route and the asset_url template helper"""
+        app.add_url_rule(f"{self.url_prefix}/<path:filename>", 'hashed_asset', self.serve)
+        app.jinja_env.globals['asset_url'] = self.asset_url
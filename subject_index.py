@@ -0,0 +1,140 @@
+import numpy as np
+from sklearn.decomposition import PCA
+import time
+from typing import List, Dict, Tuple, Any, Optional
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Rows scored per block so that float16 storage is widened in cache-sized chunks
+SEARCH_BLOCK_SIZE = 4096
+
+
+class SubjectIndex:
+    """
+    Cosine similarity index over subject embeddings, optionally reduced with PCA
+    and stored as float16
+    """
+
+    def __init__(self, subjects: List[str], embeddings: np.ndarray, n_components: Optional[int] = None,
+                 dtype: np.dtype = np.float32):
+        """
+        Initialize the SubjectIndex
+
+        Args:
+            subjects: Subject names, one per embedding row
+            embeddings: Matrix of subject embeddings (n_subjects x dim)
+            n_components: Number of PCA dimensions to keep, or None for full dimension
+            dtype: Storage dtype for the indexed vectors (np.float32 or np.float16)
+        """
+        self.subjects = list(subjects)
+        self.pca = None
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if n_components is not None:
+            # PCA cannot keep more components than there are samples or features
+            n_components = min(n_components, embeddings.shape[0], embeddings.shape[1])
+            self.pca = PCA(n_components=n_components).fit(embeddings)
+            self.pca.components_ = self.pca.components_.astype(np.float32)
+            self.pca.mean_ = self.pca.mean_.astype(np.float32)
+            embeddings = self.pca.transform(embeddings).astype(np.float32)
+
+        self.vectors = self._normalize(embeddings).astype(dtype)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    @property
+    def dimensions(self) -> int:
+        """Dimension of the stored vectors"""
+        return self.vectors.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the stored vectors and the projection"""
+        projection_bytes = 0
+        if self.pca is not None:
+            projection_bytes = self.pca.components_.nbytes + self.pca.mean_.nbytes
+        return self.vectors.nbytes + projection_bytes
+
+    def project(self, query: np.ndarray) -> np.ndarray:
+        """Project and normalize a query embedding the same way as the indexed vectors"""
+        query = np.asarray(query, dtype=np.float32).reshape(1, -1)
+        if self.pca is not None:
+            query = (query - self.pca.mean_) @ self.pca.components_.T
+        return self._normalize(query)[0]
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of a query embedding with every indexed subject
+
+        Args:
+            query: Query embedding in the original embedding space
+
+        Returns:
+            Array of similarity scores, one per subject
+        """
+        query = self.project(query)
+        scores = np.empty(len(self.subjects), dtype=np.float32)
+        for start in range(0, len(self.subjects), SEARCH_BLOCK_SIZE):
+            block = self.vectors[start:start + SEARCH_BLOCK_SIZE].astype(np.float32, copy=False)
+            scores[start:start + SEARCH_BLOCK_SIZE] = block @ query
+        return scores
+
+    def search(self, query: np.ndarray) -> Tuple[str, float]:
+        """
+        Find the most similar subject for a query embedding
+
+        Args:
+            query: Query embedding in the original embedding space
+
+        Returns:
+            Tuple of the best matching subject and its similarity score
+        """
+        scores = self.scores(query)
+        best = int(np.argmax(scores))
+        return self.subjects[best], float(scores[best])
+
+
+def compare_indexes(full_index: SubjectIndex, reduced_index: SubjectIndex, queries: np.ndarray,
+                    repeats: int = 20) -> Dict[str, Any]:
+    """
+    Compare a reduced index against the full-dimension index
+
+    Args:
+        full_index: Full-dimension float32 index
+        reduced_index: Reduced and/or float16 index over the same subjects
+        queries: Matrix of query embeddings
+        repeats: Number of times to repeat the queries when timing
+
+    Returns:
+        Dictionary with memory, timing and top-1 agreement figures
+    """
+    def timed_search(index: SubjectIndex) -> Tuple[List[str], float]:
+        matches = [index.search(query)[0] for query in queries]
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for query in queries:
+                index.search(query)
+        return matches, (time.perf_counter() - start) / (repeats * len(queries))
+
+    full_matches, full_time = timed_search(full_index)
+    reduced_matches, reduced_time = timed_search(reduced_index)
+    agreement = sum(a == b for a, b in zip(full_matches, reduced_matches)) / len(queries) if len(queries) else 1.0
+
+    return {
+        'subjects': len(full_index.subjects),
+        'full_dimensions': full_index.dimensions,
+        'reduced_dimensions': reduced_index.dimensions,
+        'full_bytes': full_index.nbytes,
+        'reduced_bytes': reduced_index.nbytes,
+        'memory_saved_bytes': full_index.nbytes - reduced_index.nbytes,
+        'full_search_seconds': full_time,
+        'reduced_search_seconds': reduced_time,
+        'speedup': full_time / reduced_time if reduced_time else float('inf'),
+        'top1_agreement': agreement
+    }
@@ -0,0 +1,294 @@
+import numpy as np
+import hashlib
+import json
+import math
+import re
+import sys
+import threading
+from collections import Counter
+from typing import List, Dict, Any, Callable, Optional, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Common alternative names for the subjects in the resources data
+DEFAULT_SUBJECT_ALIASES = {
+    'cs': 'Computer Science',
+    'comp sci': 'Computer Science',
+    'computing': 'Computer Science',
+    'computer engineering': 'Computer Science',
+    'software engineering': 'Computer Science',
+    'software developer': 'Computer Science',
+    'software development': 'Computer Science',
+    'programming': 'Computer Science',
+    'data scientist': 'Data Science',
+    'data analytics': 'Data Science',
+    'data analysis': 'Data Science',
+    'machine learning': 'Data Science',
+    'artificial intelligence': 'Data Science',
+    'statistics': 'Data Science',
+    'doctor': 'Medicine',
+    'medical': 'Medicine',
+    'pre-med': 'Medicine',
+    'premed': 'Medicine',
+    'medical school': 'Medicine',
+    'teacher': 'Education',
+    'teaching': 'Education',
+    'pedagogy': 'Education',
+    'lawyer': 'Law',
+    'legal studies': 'Law',
+    'pre-law': 'Law',
+    'jurisprudence': 'Law',
+    'accountant': 'Accounting',
+    'accountancy': 'Accounting',
+    'auditing': 'Accounting'
+}
+
+# Minimum word TF-IDF cosine similarity to accept a match without BERT
+DEFAULT_NGRAM_THRESHOLD = 0.8
+
+# Minimum lead of the best subject over the second-best distinct subject
+DEFAULT_NGRAM_MARGIN = 0.15
+
+# Majors that share generic words ("studies", "engineering", "school", "science") with an
+# alias of another subject; the cheap tiers must leave them to BERT
+AMBIGUOUS_MAJORS = [
+    'Film Studies', 'Social Studies', 'law school', 'Civil Engineering',
+    'Chemical Engineering', 'Rocket Science', 'Library Science'
+]
+
+# Order in which the tiers are tried; 'degraded' is the best n-gram match when BERT is unavailable
+TIERS = ('exact', 'alias', 'ngram', 'bert', 'degraded')
+
+
+def normalize_subject(text: str) -> str:
+    """Lowercase a subject name and collapse punctuation and whitespace"""
+    text = re.sub(r"[^\w\s-]", " ", text.casefold())
+    return " ".join(text.split())
+
+
+def tokenize_subject(text: str) -> List[str]:
+    """Split a subject name into normalized words"""
+    return re.findall(r"[^\W_]+", normalize_subject(text))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between two words, or limit + 1 once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class TieredSubjectMatcher:
+    """
+    Matches free-text majors to subjects with progressively more expensive tiers:
+    exact name, alias table, word TF-IDF and finally BERT embeddings
+
+    The word tier weights words by their IDF over the subject names and aliases, so
+    generic words shared by several names count little, and words it does not know
+    count as much as the rarest known word. Misspelled words are mapped to the one
+    known word within a small edit distance.
+    """
+
+    def __init__(self, subjects: List[str], embedding_match: Callable[[str], Tuple[str, float]],
+                 aliases: Optional[Dict[str, str]] = None, ngram_threshold: float = DEFAULT_NGRAM_THRESHOLD,
+                 ngram_margin: float = DEFAULT_NGRAM_MARGIN):
+        """
+        Initialize the TieredSubjectMatcher
+
+        Args:
+            subjects: Subject names to match against
+            embedding_match: Fallback returning the best subject and score for a major
+            aliases: Mapping of alternative names to subjects (defaults to DEFAULT_SUBJECT_ALIASES)
+            ngram_threshold: Minimum word TF-IDF cosine similarity to accept without BERT
+            ngram_margin: Minimum lead over the second-best subject to accept without BERT
+        """
+        self.subjects = list(subjects)
+        self.embedding_match = embedding_match
+        self.ngram_threshold = ngram_threshold
+        self.ngram_margin = ngram_margin
+
+        self.exact = {normalize_subject(subject): subject for subject in self.subjects}
+        aliases = DEFAULT_SUBJECT_ALIASES if aliases is None else aliases
+        self.aliases = {normalize_subject(alias): subject for alias, subject in aliases.items()
+                        if subject in self.subjects}
+
+        # Word TF-IDF index over subject names and aliases (smoothed IDF, L2-normalized rows)
+        self.ngram_names = list(self.exact) + list(self.aliases)
+        self.ngram_subjects = list(self.exact.values()) + list(self.aliases.values())
+        names = [tokenize_subject(name) for name in self.ngram_names]
+        self.vocabulary = {word: column for column, word in
+                           enumerate(sorted({word for words in names for word in words}))}
+        document_frequency = np.zeros(len(self.vocabulary))
+        for words in names:
+            document_frequency[[self.vocabulary[word] for word in set(words)]] += 1
+        self.idf = np.log((1 + len(names)) / (1 + document_frequency)) + 1
+        self.unknown_idf = math.log(1 + len(names)) + 1
+        self.ngram_matrix = np.zeros((len(names), len(self.vocabulary)))
+        for row, words in enumerate(names):
+            for word in words:
+                self.ngram_matrix[row, self.vocabulary[word]] += self.idf[self.vocabulary[word]]
+        self.ngram_matrix /= np.linalg.norm(self.ngram_matrix, axis=1, keepdims=True)
+
+        self._lock = threading.Lock()
+        self.counters = Counter()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The lock, counters and BERT fallback belong to the running process
+        state = dict(self.__dict__)
+        del state['_lock']
+        state['embedding_match'] = None
+        state['counters'] = Counter()
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _record(self, tier: str) -> None:
+        with self._lock:
+            self.counters['lookups'] += 1
+            self.counters[tier] += 1
+
+    @property
+    def version(self) -> str:
+        """Hash of the subjects, alias table and acceptance thresholds, which decide the matches"""
+        config = {'subjects': self.subjects, 'aliases': self.aliases, 'threshold': self.ngram_threshold,
+                  'margin': self.ngram_margin, 'tiers': TIERS}
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def known_word(self, word: str) -> Optional[str]:
+        """The known word a query word stands for, allowing one typo (two in long words)"""
+        if word in self.vocabulary or len(word) < 4:
+            return word if word in self.vocabulary else None
+        limit = 1 if len(word) < 8 else 2
+        distances = {known: edit_distance(word, known, limit) for known in self.vocabulary}
+        best = min(distances.values(), default=limit + 1)
+        candidates = [known for known, distance in distances.items() if distance == best]
+        return candidates[0] if best <= limit and len(candidates) == 1 else None
+
+    def ngram_match(self, major: str) -> Tuple[str, float, float]:
+        """
+        Find the closest subject by word TF-IDF similarity
+
+        Args:
+            major: Normalized major to match
+
+        Returns:
+            Tuple of the best matching subject, its similarity score and its lead over
+            the best score of any other subject
+        """
+        query = np.zeros(len(self.vocabulary))
+        unknown_weight = 0.0
+        for word in tokenize_subject(major):
+            known = self.known_word(word)
+            if known is None:
+                unknown_weight += self.unknown_idf ** 2
+            else:
+                query[self.vocabulary[known]] += self.idf[self.vocabulary[known]]
+        norm = math.sqrt(float(query @ query) + unknown_weight)
+        similarities = np.minimum(self.ngram_matrix @ query / norm, 1.0) if norm else np.zeros(len(self.ngram_names))
+
+        best_by_subject: Dict[str, float] = {}
+        for subject, similarity in zip(self.ngram_subjects, similarities):
+            best_by_subject[subject] = max(best_by_subject.get(subject, 0.0), float(similarity))
+        ranked = sorted(best_by_subject.items(), key=lambda item: -item[1])
+        subject, score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        return subject, score, score - runner_up
+
+    def match(self, major: str, allow_embedding: bool = True) -> Dict[str, Any]:
+        """
+        Match a major to a subject, calling BERT only when the cheaper tiers are unsure
+
+        Args:
+            major: The major to match
+            allow_embedding: Whether the BERT tier may be used; if not, the best n-gram
+                match is returned with the 'degraded' tier
+
+        Returns:
+            Dictionary with the matched subject, the tier that matched and its score
+        """
+        key = normalize_subject(major)
+
+        if key in self.exact:
+            self._record('exact')
+            return {'subject': self.exact[key], 'tier': 'exact', 'score': 1.0}
+
+        if key in self.aliases:
+            self._record('alias')
+            return {'subject': self.aliases[key], 'tier': 'alias', 'score': 1.0}
+
+        subject, score, margin = self.ngram_match(key) if key else (self.subjects[0], 0.0, 0.0)
+        if key and score >= self.ngram_threshold and margin >= self.ngram_margin:
+            self._record('ngram')
+            return {'subject': subject, 'tier': 'ngram', 'score': score}
+
+        if not allow_embedding:
+            self._record('degraded')
+            return {'subject': subject, 'tier': 'degraded', 'score': score}
+
+        subject, score = self.embedding_match(major)
+        self._record('bert')
+        return {'subject': subject, 'tier': 'bert', 'score': score}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit counts and hit rates for each tier
+
+        Returns:
+            Dictionary with the total lookups and per-tier hits and rates
+        """
+        with self._lock:
+            lookups = self.counters['lookups']
+            return {
+                'lookups': lookups,
+                'tiers': {
+                    tier: {
+                        'hits': self.counters[tier],
+                        'hit_rate': self.counters[tier] / lookups if lookups else 0.0
+                    }
+                    for tier in TIERS
+                }
+            }
+
+
+def check_cheap_tiers(matcher: TieredSubjectMatcher, majors: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Find the ambiguous majors that the cheap tiers match instead of leaving to BERT
+
+    Args:
+        matcher: Matcher to check
+        majors: Majors to try (defaults to AMBIGUOUS_MAJORS)
+
+    Returns:
+        Dictionary mapping each wrongly accepted major to its match
+    """
+    failures = {}
+    for major in AMBIGUOUS_MAJORS if majors is None else majors:
+        result = matcher.match(major, allow_embedding=False)
+        if result['tier'] != 'degraded':
+            failures[major] = result
+    return failures
+
+
+# Example usage
+if __name__ == "__main__":
+    subjects = ['Computer Science', 'Data Science', 'Medicine', 'Education', 'Law', 'Accounting']
+    matcher = TieredSubjectMatcher(subjects, lambda major: (subjects[0], 0.0))
+    for major in ['Computer Sciense', 'machine lerning', 'Medecine', 'legal study'] + AMBIGUOUS_MAJORS:
+        print(f"{major}: {matcher.match(major, allow_embedding=False)}")
+    failures = check_cheap_tiers(matcher)
+    for major, result in failures.items():
+        print(f"Accepted without BERT: {major} -> {result['subject']} ({result['tier']}, {result['score']:.2f})")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,167 @@
+import pandas as pd
+import numpy as np
+import heapq
+from typing import List, Dict, Any, Tuple
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Weights of the career score components (trait match, interest match)
+CAREER_WEIGHTS = (0.4, 0.6)
+
+# Slack for rounding differences between the threshold and exact scores
+THRESHOLD_EPSILON = 1e-9
+
+# Decimals scores are rounded to before ranking, so equal scores summed in a different
+# order (here and in the weight sweep) tie and are broken by row order in both
+SCORE_DECIMALS = 12
+
+
+class CareerTopKEngine:
+    """
+    Top-k career retrieval over per-trait and per-interest posting lists using the
+    threshold algorithm, stopping once no unseen occupation can enter the top k
+    """
+
+    def __init__(self, onet_data: pd.DataFrame):
+        """
+        Initialize the CareerTopKEngine
+
+        Args:
+            onet_data: DataFrame with occupation information
+        """
+        logger.info("Building career posting lists...")
+        self.records = onet_data[['occupation', 'description', 'education_required']].to_dict('records')
+        self.traits = [traits.split(',') for traits in onet_data['personality_traits']]
+        self.interests = [interests.split(',') for interests in onet_data['interests']]
+        self.trait_postings = self._build_postings(self.traits)
+        self.interest_postings = self._build_postings(self.interests)
+
+    @staticmethod
+    def _build_postings(term_lists: List[List[str]]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        # Each occupation contributes score / len(terms) for every occurrence of a term
+        weights: Dict[str, Dict[int, float]] = {}
+        for row, terms in enumerate(term_lists):
+            for term in terms:
+                rows = weights.setdefault(term, {})
+                rows[row] = rows.get(row, 0) + 1 / len(terms)
+
+        postings = {}
+        for term, rows in weights.items():
+            ordered = sorted(rows.items(), key=lambda item: (-item[1], item[0]))
+            postings[term] = (np.array([row for row, _ in ordered]), np.array([weight for _, weight in ordered]))
+        return postings
+
+    @property
+    def size(self) -> int:
+        """Number of occupations in the catalog"""
+        return len(self.records)
+
+    def score_row(self, row: int, trait_scores: Dict[str, float], interest_scores: Dict[str, float]) -> float:
+        """Exact match score of one occupation, computed like a full scan"""
+        traits = self.traits[row]
+        interests = self.interests[row]
+
+        trait_match = 0
+        for trait in traits:
+            if trait in trait_scores:
+                trait_match += trait_scores[trait]
+        trait_match = trait_match / len(traits) if traits else 0
+
+        interest_match = 0
+        for interest in interests:
+            if interest in interest_scores:
+                interest_match += interest_scores[interest]
+        interest_match = interest_match / len(interests) if interests else 0
+
+        return float(np.round(CAREER_WEIGHTS[0] * trait_match + CAREER_WEIGHTS[1] * interest_match, SCORE_DECIMALS))
+
+    def _result(self, row: int, score: float) -> Dict[str, Any]:
+        return dict(self.records[row], score=score)
+
+    def full_scan(self, trait_scores: Dict[str, float], interest_scores: Dict[str, float],
+                  top_n: int = 3) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Score every occupation and return the top N
+
+        Args:
+            trait_scores: Dictionary mapping traits to scores
+            interest_scores: Dictionary mapping interests to scores
+            top_n: Number of top recommendations to return
+
+        Returns:
+            Tuple of the recommended careers and access statistics
+        """
+        scores = [(self.score_row(row, trait_scores, interest_scores), row) for row in range(self.size)]
+        scores.sort(key=lambda item: (-item[0], item[1]))
+        results = [self._result(row, score) for score, row in scores[:top_n]]
+        return results, {'touched': self.size, 'total': self.size, 'sorted_accesses': 0}
+
+    def search(self, trait_scores: Dict[str, float], interest_scores: Dict[str, float],
+               top_n: int = 3) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Find the top N occupations with the threshold algorithm
+
+        Args:
+            trait_scores: Dictionary mapping traits to scores
+            interest_scores: Dictionary mapping interests to scores
+            top_n: Number of top recommendations to return
+
+        Returns:
+            Tuple of the recommended careers (same ranking as full_scan) and access statistics
+        """
+        if top_n <= 0 or any(score < 0 for score in list(trait_scores.values()) + list(interest_scores.values())):
+            # The threshold bound assumes non-negative contributions and a non-empty top N
+            return self.full_scan(trait_scores, interest_scores, top_n)
+
+        # Posting lists of the query terms, with the factor turning weights into score contributions
+        lists = []
+        for weight, scores, postings in ((CAREER_WEIGHTS[0], trait_scores, self.trait_postings),
+                                         (CAREER_WEIGHTS[1], interest_scores, self.interest_postings)):
+            for term, score in scores.items():
+                if score > 0 and term in postings:
+                    rows, weights = postings[term]
+                    lists.append((weight * score, rows, weights))
+
+        seen: Dict[int, float] = {}
+        # Min-heap of the current top N as (score, -row) so the worst entry is on top
+        heap: List[Tuple[float, int]] = []
+        sorted_accesses = 0
+        depth = 0
+        max_depth = max((len(rows) for _, rows, _ in lists), default=0)
+
+        while depth < max_depth:
+            for factor, rows, weights in lists:
+                if depth >= len(rows):
+                    continue
+                sorted_accesses += 1
+                row = int(rows[depth])
+                if row in seen:
+                    continue
+                score = self.score_row(row, trait_scores, interest_scores)
+                seen[row] = score
+                entry = (score, -row)
+                if len(heap) < top_n:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+            depth += 1
+
+            # Best score any unseen occupation could still reach
+            threshold = sum(factor * weights[depth] for factor, rows, weights in lists if depth < len(rows))
+            if len(heap) == top_n and heap[0][0] > threshold + THRESHOLD_EPSILON:
+                break
+
+        ranked = sorted(seen.items(), key=lambda item: (-item[1], item[0]))[:top_n]
+        if len(ranked) < top_n:
+            # Every list is exhausted: the remaining occupations match nothing and score zero
+            for row in range(self.size):
+                if len(ranked) == top_n:
+                    break
+                if row not in seen:
+                    ranked.append((row, self.score_row(row, trait_scores, interest_scores)))
+
+        results = [self._result(row, score) for row, score in ranked]
+        return results, {'touched': len(seen), 'total': self.size, 'sorted_accesses': sorted_accesses}
@@ -0,0 +1,157 @@
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Any, Iterable, Optional, Union
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Numeric columns that get sorted-array range indexes
+RANGE_COLUMNS = ('cost', 'acceptance_rate', 'graduation_rate')
+
+# Weights of the university score components (program match, cost, acceptance, graduation)
+UNIVERSITY_WEIGHTS = (0.5, 0.2, 0.1, 0.2)
+
+
+class UniversityIndex:
+    """
+    Secondary indexes over the college data: boolean bitmaps for locations and
+    programs, and sorted arrays for range filters on the numeric columns
+    """
+
+    def __init__(self, college_data: pd.DataFrame):
+        """
+        Initialize the UniversityIndex
+
+        Args:
+            college_data: DataFrame with university information
+        """
+        logger.info("Building university indexes...")
+        self.size = len(college_data)
+        self.records = college_data.to_dict('records')
+
+        # Bitmap indexes for equality filters
+        self.location_bitmaps = self._build_bitmaps(college_data['location'].map(lambda location: [location]))
+        self.program_bitmaps = self._build_bitmaps(college_data['programs'].str.split(','))
+
+        # Sorted arrays for range filters
+        self.sorted_values = {}
+        self.sorted_rows = {}
+        for column in RANGE_COLUMNS:
+            values = college_data[column].to_numpy()
+            order = np.argsort(values, kind='stable')
+            self.sorted_rows[column] = order
+            self.sorted_values[column] = values[order]
+
+        # Score components that do not depend on the request
+        self.cost_score = 1 - (college_data['cost'].to_numpy() / 60000)
+        self.acceptance_score = college_data['acceptance_rate'].to_numpy(dtype=float)
+        self.graduation_score = college_data['graduation_rate'].to_numpy(dtype=float)
+
+    def _build_bitmaps(self, values: Iterable[List[str]]) -> Dict[str, np.ndarray]:
+        bitmaps = {}
+        for row, keys in enumerate(values):
+            for key in keys:
+                if key not in bitmaps:
+                    bitmaps[key] = np.zeros(self.size, dtype=bool)
+                bitmaps[key][row] = True
+        return bitmaps
+
+    def _empty(self) -> np.ndarray:
+        return np.zeros(self.size, dtype=bool)
+
+    def at_most(self, column: str, value: float) -> np.ndarray:
+        """Bitmap of rows where the column is at most the given value"""
+        mask = self._empty()
+        mask[self.sorted_rows[column][:np.searchsorted(self.sorted_values[column], value, side='right')]] = True
+        return mask
+
+    def at_least(self, column: str, value: float) -> np.ndarray:
+        """Bitmap of rows where the column is at least the given value"""
+        mask = self._empty()
+        mask[self.sorted_rows[column][np.searchsorted(self.sorted_values[column], value, side='left'):]] = True
+        return mask
+
+    def filter(self, state: Optional[Union[str, List[str]]] = None, max_cost: Optional[float] = None,
+               min_graduation_rate: Optional[float] = None,
+               required_programs: Optional[List[str]] = None) -> np.ndarray:
+        """
+        Combine the constraint bitmaps into a single row mask
+
+        Args:
+            state: State, or list of acceptable states
+            max_cost: Maximum annual cost
+            min_graduation_rate: Minimum graduation rate (0-1)
+            required_programs: Programs a university must offer, all of them
+
+        Returns:
+            Boolean mask of the universities satisfying every constraint
+        """
+        mask = np.ones(self.size, dtype=bool)
+
+        if state:
+            states = [state] if isinstance(state, str) else state
+            state_mask = self._empty()
+            for value in states:
+                state_mask |= self.location_bitmaps.get(value, False)
+            mask &= state_mask
+
+        if max_cost is not None:
+            mask &= self.at_most('cost', max_cost)
+
+        if min_graduation_rate is not None:
+            mask &= self.at_least('graduation_rate', min_graduation_rate)
+
+        for program in required_programs or []:
+            if program not in self.program_bitmaps:
+                return self._empty()
+            mask &= self.program_bitmaps[program]
+
+        return mask
+
+    def program_match(self, fields: Iterable[str]) -> np.ndarray:
+        """Fraction of the given fields offered by each university"""
+        fields = set(fields)
+        if not fields:
+            return np.zeros(self.size)
+        counts = np.zeros(self.size, dtype=int)
+        for field in fields:
+            if field in self.program_bitmaps:
+                counts += self.program_bitmaps[field]
+        return counts / len(fields)
+
+    def score(self, fields: Iterable[str], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Combined recommendation score of each university
+
+        Args:
+            fields: Recommended fields of study
+            rows: Row indices to score (defaults to all rows)
+
+        Returns:
+            Array of scores for the requested rows
+        """
+        program_weight, cost_weight, acceptance_weight, graduation_weight = UNIVERSITY_WEIGHTS
+        rows = np.arange(self.size) if rows is None else rows
+        return (program_weight * self.program_match(fields)[rows]
+                + cost_weight * self.cost_score[rows]
+                + acceptance_weight * self.acceptance_score[rows]
+                + graduation_weight * self.graduation_score[rows])
+
+    def recommend(self, fields: Iterable[str], top_n: int = 3, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Filter the universities with the indexes, then score and rank the remaining rows
+
+        Args:
+            fields: Recommended fields of study
+            top_n: Number of top recommendations to return
+            **filters: Constraints accepted by filter()
+
+        Returns:
+            List of recommended universities with details
+        """
+        rows = np.flatnonzero(self.filter(**filters))
+        scores = self.score(fields, rows)
+        ranked = np.argsort(-scores, kind='stable')[:top_n]
+        return [dict(self.records[rows[i]], score=float(scores[i])) for i in ranked]
@@ -0,0 +1,152 @@
+import numpy as np
+from scipy import sparse
+from typing import List, Dict, Any, Iterable, Optional, Sequence
+import logging
+from topk_engine import CareerTopKEngine, SCORE_DECIMALS
+from university_index import UniversityIndex
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def top_rows(scores: np.ndarray, top_n: int) -> List[np.ndarray]:
+    """
+    Rank the rows of a score matrix separately for every column
+
+    Args:
+        scores: Matrix of scores (n_rows x n_columns)
+        top_n: Number of rows to keep per column
+
+    Returns:
+        List with, for each column, the top row indices by descending score (ties by row order)
+    """
+    n_rows, n_columns = scores.shape
+    top_n = max(0, min(top_n, n_rows))
+    if top_n == 0:
+        return [np.array([], dtype=int) for _ in range(n_columns)]
+
+    # k-th best score per column, then an exact sort of the rows reaching it
+    kth = -np.partition(-scores, top_n - 1, axis=0)[top_n - 1]
+    rankings = []
+    for column in range(n_columns):
+        candidates = np.flatnonzero(scores[:, column] >= kth[column])
+        order = np.lexsort((candidates, -scores[candidates, column]))
+        rankings.append(candidates[order][:top_n])
+    return rankings
+
+
+class WeightSweeper:
+    """
+    Evaluates recommendation rankings for a whole grid of score weights at once,
+    reusing precomputed component-score matrices
+    """
+
+    def __init__(self, career_engine: CareerTopKEngine, university_index: UniversityIndex):
+        """
+        Initialize the WeightSweeper
+
+        Args:
+            career_engine: Career posting lists to build the trait and interest matrices from
+            university_index: University index with the precomputed score components
+        """
+        logger.info("Building component score matrices...")
+        self.career_engine = career_engine
+        self.university_index = university_index
+
+        self.trait_terms, self.trait_matrix = self._posting_matrix(career_engine.trait_postings, career_engine.size)
+        self.interest_terms, self.interest_matrix = self._posting_matrix(career_engine.interest_postings,
+                                                                         career_engine.size)
+
+        # Request-independent university components: cost, acceptance and graduation
+        self.university_components = np.column_stack([university_index.cost_score,
+                                                      university_index.acceptance_score,
+                                                      university_index.graduation_score])
+
+    @staticmethod
+    def _posting_matrix(postings: Dict[str, Any], size: int):
+        terms = {term: column for column, term in enumerate(postings)}
+        rows, columns, weights = [], [], []
+        for term, (term_rows, term_weights) in postings.items():
+            rows.append(term_rows)
+            columns.append(np.full(len(term_rows), terms[term]))
+            weights.append(term_weights)
+        matrix = sparse.csr_matrix((np.concatenate(weights), (np.concatenate(rows), np.concatenate(columns))),
+                                   shape=(size, len(terms)))
+        return terms, matrix
+
+    @staticmethod
+    def _score_vector(terms: Dict[str, int], scores: Dict[str, float]) -> np.ndarray:
+        vector = np.zeros(len(terms))
+        for term, score in scores.items():
+            if term in terms:
+                vector[terms[term]] = score
+        return vector
+
+    @staticmethod
+    def _weight_grid(weight_grid: Sequence[Sequence[float]], n_components: int) -> np.ndarray:
+        grid = np.asarray(weight_grid, dtype=float)
+        if grid.ndim != 2 or grid.shape[1] != n_components:
+            raise ValueError(f"Weight grid must have shape (n, {n_components}), got {grid.shape}")
+        return grid
+
+    def career_components(self, trait_scores: Dict[str, float], interest_scores: Dict[str, float]) -> np.ndarray:
+        """Trait match and interest match of every occupation (n_occupations x 2)"""
+        trait_match = self.trait_matrix @ self._score_vector(self.trait_terms, trait_scores)
+        interest_match = self.interest_matrix @ self._score_vector(self.interest_terms, interest_scores)
+        return np.column_stack([trait_match, interest_match])
+
+    def sweep_careers(self, trait_scores: Dict[str, float], interest_scores: Dict[str, float],
+                      weight_grid: Sequence[Sequence[float]], top_n: int = 3) -> List[Dict[str, Any]]:
+        """
+        Rank occupations for every (trait, interest) weight pair in the grid
+
+        Args:
+            trait_scores: Dictionary mapping traits to scores
+            interest_scores: Dictionary mapping interests to scores
+            weight_grid: Weight vectors, one (trait, interest) pair per row
+            top_n: Number of top occupations per weight vector
+
+        Returns:
+            List with the weights, ranked occupations and scores for each weight vector
+        """
+        grid = self._weight_grid(weight_grid, 2)
+        # Rounded like CareerTopKEngine.score_row so ties rank the same as recommend_careers
+        scores = np.round(self.career_components(trait_scores, interest_scores) @ grid.T, SCORE_DECIMALS)
+
+        sweep = []
+        for column, rows in enumerate(top_rows(scores, top_n)):
+            sweep.append({
+                'weights': grid[column].tolist(),
+                'ranking': [self.career_engine.records[row]['occupation'] for row in rows],
+                'scores': scores[rows, column].tolist()
+            })
+        return sweep
+
+    def sweep_universities(self, fields: Iterable[str], weight_grid: Sequence[Sequence[float]], top_n: int = 3,
+                           filter_mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Rank universities for every (program, cost, acceptance, graduation) weight vector in the grid
+
+        Args:
+            fields: Recommended fields of study
+            weight_grid: Weight vectors, one 4-tuple per row
+            top_n: Number of top universities per weight vector
+            filter_mask: Optional boolean mask restricting the universities
+
+        Returns:
+            List with the weights, ranked universities and scores for each weight vector
+        """
+        grid = self._weight_grid(weight_grid, 4)
+        components = np.column_stack([self.university_index.program_match(fields), self.university_components])
+        rows = np.arange(self.university_index.size) if filter_mask is None else np.flatnonzero(filter_mask)
+        scores = components[rows] @ grid.T
+
+        sweep = []
+        for column, ranked in enumerate(top_rows(scores, top_n)):
+            sweep.append({
+                'weights': grid[column].tolist(),
+                'ranking': [self.university_index.records[rows[i]]['university'] for i in ranked],
+                'scores': scores[ranked, column].tolist()
+            })
+        return sweep